@@ -2,8 +2,13 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from tfidf_model import load_or_fit
+from fuzzy_skills import FuzzySkillResolver
+from skill_vocab import canonical_set, canonical_skills, canonical_text
+from charts import cached_figure, chart_key
+from progressive import reserve
+from metrics import Run, debug_panel, debug_requested
+from report_cache import catalog_version
 
 # ===================== PAGE CONFIG =====================
 st.set_page_config(
@@ -57,6 +62,8 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # ===================== DATA =====================
+debug = debug_requested()
+run = Run("app", trace_memory=debug)
 data = {
     "Career": [
         "Data Scientist","Web Developer","AI Engineer","UI/UX Designer",
@@ -101,13 +108,20 @@ data = {
 }
 
 df = pd.DataFrame(data)
+catalog_id = catalog_version(df)
+run.lap("load")
 
 # ===================== FUNCTIONS =====================
-def similarity(user, skills):
-    vec = TfidfVectorizer()
-    m = vec.fit_transform(skills)
-    u = vec.transform([user])
-    return cosine_similarity(u, m).flatten()
+@st.cache_resource
+def load_tfidf(skills):
+    return load_or_fit([canonical_text(s) for s in skills])
+
+@st.cache_resource
+def load_resolver(skills):
+    return FuzzySkillResolver(set().union(*(canonical_skills(s) for s in skills)))
+
+def top_matches(user, skills, k):
+    return load_tfidf(tuple(skills)).top_k(canonical_text(user), k)
 
 def badge(score):
     if score >= 80:
@@ -118,26 +132,31 @@ def badge(score):
         return "⚠️ Needs Improvement"
 
 def missing(user_set, req):
-    return set(s.strip().lower() for s in req.split(",")) - user_set
+    return canonical_skills(req) - canonical_set(user_set)
 
 def radar_chart(row, user_set):
-    req = set(s.strip().lower() for s in row["Required_Skills"].split(","))
-    skills = list(req | user_set)
-    df_radar = pd.DataFrame({
-        "Skill": skills * 2,
-        "Value": [1 if s in user_set else 0 for s in skills] +
-                 [1 if s in req else 0 for s in skills],
-        "Type": ["You"]*len(skills) + ["Required"]*len(skills)
-    })
-    fig = px.line_polar(
-        df_radar,
-        r="Value",
-        theta="Skill",
-        color="Type",
-        line_close=True,
-        color_discrete_sequence=px.colors.sequential.Plasma
-    )
-    fig.update_traces(fill="toself")
+    req = canonical_skills(row["Required_Skills"])
+    user = canonical_set(user_set)
+
+    def build():
+        skills = list(req | user)
+        df_radar = pd.DataFrame({
+            "Skill": skills * 2,
+            "Value": [1 if s in user else 0 for s in skills] +
+                     [1 if s in req else 0 for s in skills],
+            "Type": ["You"]*len(skills) + ["Required"]*len(skills)
+        })
+        fig = px.line_polar(
+            df_radar,
+            r="Value",
+            theta="Skill",
+            color="Type",
+            line_close=True,
+            color_discrete_sequence=px.colors.sequential.Plasma
+        )
+        return fig.update_traces(fill="toself")
+
+    fig = cached_figure(("app.radar", canonical_text(req), canonical_text(user)), build)
     st.plotly_chart(fig, use_container_width=True)
 
 # ===================== UI =====================
@@ -148,12 +167,19 @@ user_input = st.text_area(
     "🧠 Enter your skills (comma separated)",
     "Python, SQL, HTML"
 )
+run.skip()
 
-user_skills = set(s.strip().lower() for s in user_input.split(","))
+user_skills, corrections = load_resolver(tuple(df["Required_Skills"])).correct(user_input.split(","))
+run.lap("normalize")
+if corrections:
+    st.caption("🔤 Did you mean: " + ", ".join(f"{typed} → {fixed}" for typed, fixed in corrections.items()))
 
 if st.button("🚀 Analyze My Career"):
-    df["Match_Score"] = similarity(user_input, df["Required_Skills"]) * 100
-    df = df.sort_values("Match_Score", ascending=False).reset_index(drop=True)
+    top_ids, top_scores = top_matches(user_skills, df["Required_Skills"], 7)
+    run.lap("score")
+    df = df.iloc[top_ids].reset_index(drop=True)
+    df["Match_Score"] = top_scores * 100
+    run.lap("rank")
 
     # ===================== TOP 3 CARDS =====================
     st.markdown("## 🏆 Top 3 Matches")
@@ -181,27 +207,34 @@ if st.button("🚀 Analyze My Career"):
             </div>
             """, unsafe_allow_html=True)
 
+    run.lap("cards")
+
     # ===================== ANALYTICS =====================
     st.markdown("---")
-    colA, colB = st.columns(2)
-
-    with colA:
-        st.subheader("📊 Career Match Overview")
-        fig = px.bar(
-            df.head(7),
-            x="Match_Score",
-            y="Career",
-            orientation="h",
-            color="Match_Score",
-            color_continuous_scale=px.colors.sequential.Plasma
-        )
-        fig.update_layout(yaxis={'categoryorder': 'total ascending'})
-        st.plotly_chart(fig, use_container_width=True)
-
-    with colB:
-        st.subheader("🎯 Deep Dive: Top Career")
-        radar_chart(df.iloc[0], user_skills)
+    analytics_slot = reserve("charts")[0]
+    with analytics_slot.container():
+        colA, colB = st.columns(2)
+
+        with colA:
+            st.subheader("📊 Career Match Overview")
+            fig = cached_figure(chart_key("app.bar", user_skills, catalog_id), lambda: px.bar(
+                df.head(7),
+                x="Match_Score",
+                y="Career",
+                orientation="h",
+                color="Match_Score",
+                color_continuous_scale=px.colors.sequential.Plasma
+            ).update_layout(yaxis={'categoryorder': 'total ascending'}))
+            st.plotly_chart(fig, use_container_width=True)
+
+        with colB:
+            st.subheader("🎯 Deep Dive: Top Career")
+            radar_chart(df.iloc[0], user_skills)
+    run.lap("charts")
 
 # ===================== FOOTER =====================
+run.finish()
 st.markdown("---")
 st.caption("Built with ❤️ by Rohit | Career Guide AI v3.1")
+if debug:
+    debug_panel(run)
@@ -0,0 +1,77 @@
+# ===================== IMPORTS =====================
+from bisect import bisect_left, bisect_right
+
+import numpy as np
+
+from skill_vocab import canonical
+
+# Autocomplete over canonical skill names. Every word start of every skill
+# ("machine learning" -> "machine learning", "learning") goes into one sorted
+# key list, so a typed prefix is a single bisect range. Matches never cross
+# skill boundaries, and the per-keystroke cost depends on the vocabulary,
+# not on how many careers the catalog has.
+
+WORD_BREAKS = " -/._("
+
+
+# ===================== INDEX =====================
+class SkillAutocomplete:
+    def __init__(self, names, skill_careers, display=None):
+        # skill_careers: CSC careers x skills matrix, column j lists the careers needing skill j
+        self.names = list(names)
+        self.ids = {name: j for j, name in enumerate(self.names)}
+        self.display = list(display) if display is not None else self.names
+        self.indptr = skill_careers.indptr
+        self.careers_of = skill_careers.indices
+        self.popularity = np.diff(self.indptr)
+
+        entries = sorted(
+            (name[i:], j, i == 0)
+            for j, name in enumerate(self.names)
+            for i in range(len(name))
+            if i == 0 or (name[i - 1] in WORD_BREAKS and name[i] not in WORD_BREAKS)
+        )
+        self.keys = [key for key, _, _ in entries]
+        self.key_len = np.array([len(key) for key in self.keys], dtype=np.int32)
+        self.key_skill = np.array([j for _, j, _ in entries], dtype=np.int32)
+        # exact > whole-name prefix > word prefix, then by how many careers need the skill
+        self.key_rank = np.array([int(start) for _, _, start in entries], dtype=np.int64) * 2 ** 32 \
+            + self.popularity[self.key_skill]
+
+    @classmethod
+    def from_engine(cls, engine):
+        return cls(engine.skill_names, engine.matrix.tocsc(), engine.vocab.display)
+
+    def complete(self, text, limit=8):
+        # -> ranked skill ids whose name (or a word in it) starts with ``text``;
+        # an input that is exactly an alias ("sklearn") also offers its skill, first
+        query = " ".join(text.lower().split())
+        if not query:
+            return []
+        alias = self.ids.get(canonical(text))
+        alias = [] if alias is None or self.names[alias] == query else [alias]
+        lo = bisect_left(self.keys, query)
+        hi = bisect_right(self.keys, query + "\U0010ffff")
+        if lo == hi:
+            return alias[:limit]
+        rank = self.key_rank[lo:hi] + (self.key_len[lo:hi] == len(query)) * 2 ** 34
+        take = min(len(rank), 2 * limit)  # a skill can match on more than one word
+        top = np.argpartition(-rank, take - 1)[:take] if take < len(rank) else np.arange(len(rank))
+        top = top[np.lexsort((self.key_skill[lo + top], -rank[top]))]
+        ranked = dict.fromkeys(alias + [int(j) for j in self.key_skill[lo + top]])
+        return list(ranked)[:limit]
+
+    def careers(self, skill_ids, limit=10):
+        # -> [(career id, skill id)]: careers of the best completion first, in
+        # catalog order; stops after ``limit`` so huge postings are never walked
+        found = {}
+        for j in skill_ids:
+            for i in self.careers_of[self.indptr[j]:self.indptr[j + 1]]:
+                if len(found) >= limit:
+                    return list(found.items())
+                found.setdefault(int(i), j)
+        return list(found.items())
+
+    def search(self, text, limit=10):
+        skill_ids = self.complete(text)
+        return skill_ids, self.careers(skill_ids, limit)
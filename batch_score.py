@@ -0,0 +1,112 @@
+# ===================== IMPORTS =====================
+import argparse
+import csv
+import json
+import sys
+import time
+
+from catalog import CATALOG_PATH
+from catalog_db import CatalogDB
+from recommender import MODES, Recommender
+
+# Headless batch scoring: score a whole cohort of skill profiles against the
+# career catalog without a Streamlit session.
+#
+#   python batch_score.py profiles.csv -o results.jsonl --top-k 3
+#
+# profiles.csv needs a "skills" column (comma separated, like the text box in
+# the apps) and optionally an "id" column. --db scores against a SQLite
+# catalog from catalog_db.py instead of loading the CSV (rule mode only).
+
+
+# ===================== PROFILES =====================
+def read_profiles(path, id_column, skills_column, chunk_size):
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        if skills_column not in (reader.fieldnames or []):
+            raise SystemExit(f"{path}: missing '{skills_column}' column")
+        chunk = []
+        for n, row in enumerate(reader):
+            skills = [s.strip() for s in (row[skills_column] or "").split(",") if s.strip()]
+            chunk.append((row.get(id_column) or str(n), skills))
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+# ===================== WRITERS =====================
+class CsvResultWriter:
+    def __init__(self, f):
+        self.writer = csv.writer(f)
+        self.writer.writerow(["id", "rank", "career", "match_score", "badge", "missing_skills", "salary", "learn_link"])
+
+    def write(self, profile_id, results):
+        for rank, r in enumerate(results, 1):
+            self.writer.writerow([
+                profile_id, rank, r["career"], f"{r['match_score']:.2f}",
+                r["badge"], "; ".join(r["missing_skills"]), r["salary"], r["learn_link"]
+            ])
+
+
+class JsonlResultWriter:
+    def __init__(self, f):
+        self.f = f
+
+    def write(self, profile_id, results):
+        self.f.write(json.dumps({"id": profile_id, "results": results}, ensure_ascii=False) + "\n")
+
+
+# ===================== SCORING =====================
+def run(args):
+    if args.db:
+        recommender = CatalogDB(args.db)
+    else:
+        recommender = Recommender.load(args.catalog, hybrid=args.mode == "hybrid")
+
+    out_format = args.format or ("csv" if args.output.endswith(".csv") else "jsonl")
+    out = sys.stdout if args.output == "-" else open(args.output, "w", newline="", encoding="utf-8")
+    writer = CsvResultWriter(out) if out_format == "csv" else JsonlResultWriter(out)
+
+    done = 0
+    start = time.perf_counter()
+    try:
+        for chunk in read_profiles(args.profiles, args.id_column, args.skills_column, args.chunk_size):
+            ids = [p[0] for p in chunk]
+            recs = recommender.recommend_many([p[1] for p in chunk], args.top_k, args.mode)
+            for profile_id, results in zip(ids, recs):
+                writer.write(profile_id, results)
+            out.flush()
+
+            done += len(chunk)
+            elapsed = time.perf_counter() - start
+            print(f"scored {done} profiles ({done / elapsed:.0f}/s)", file=sys.stderr)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+# ===================== CLI =====================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score a cohort of skill profiles against the career catalog.")
+    parser.add_argument("profiles", help="CSV file with a skills column")
+    parser.add_argument("-o", "--output", default="-", help="output file (.csv or .jsonl), '-' for stdout")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="output format (default: from file suffix)")
+    parser.add_argument("--catalog", default=CATALOG_PATH)
+    parser.add_argument("--db", help="SQLite catalog built by catalog_db.py, used instead of --catalog")
+    parser.add_argument("--mode", choices=MODES, default="rule",
+                        help="rule = matched/required (career_guide_ai_modern.py), hybrid = 0.7 rule + 0.3 TF-IDF (real.py), "
+                             "approx = rule over MinHash LSH candidates (large catalogs)")
+    parser.add_argument("--top-k", type=int, default=3)
+    parser.add_argument("--id-column", default="id")
+    parser.add_argument("--skills-column", default="skills")
+    parser.add_argument("--chunk-size", type=int, default=2048)
+    args = parser.parse_args(argv)
+    if args.db and args.mode not in CatalogDB.modes:
+        parser.error(f"--db supports --mode {', '.join(CatalogDB.modes)} only")
+    run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+# ===================== IMPORTS =====================
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from binary_catalog import CompiledCatalog, compile_catalog
+from catalog import load_catalog
+from hybrid_kernel import HybridKernel
+from lsh_index import MinHashLSH, recall_at_k
+from recommender import Recommender
+from scoring_engine import SkillScoringEngine, top_k_rows
+from skill_vocab import canonical_text
+from synthetic_catalog import SkillModel, write_catalog
+from tfidf_model import TfidfModel
+
+# Scaling benchmark for the scoring paths on synthetic catalogs.
+#
+#   python benchmark.py --sizes 50,10000,100000,1000000 -o bench.json
+#   python benchmark.py --sizes 50,10000 --compare bench-old.json
+#
+# For every catalog size it times ingest (CSV read, compile, mmap open),
+# index builds, single-query latency (p50 / p99) of each scoring path and
+# batch throughput. Results are written as JSON together with the git
+# commit, so runs on different commits can be compared with --compare.
+
+SIZES = [50, 10_000, 100_000, 1_000_000]
+BATCH_CELLS = 32_000_000  # profiles x careers per dense batch
+
+
+# ===================== TIMING =====================
+def timed(fn):
+    start = time.perf_counter()
+    value = fn()
+    return value, time.perf_counter() - start
+
+
+def latency(fn, queries, warmup=5):
+    for q in queries[:warmup]:
+        fn(q)
+    samples = []
+    for q in queries:
+        start = time.perf_counter()
+        fn(q)
+        samples.append(time.perf_counter() - start)
+    samples = np.array(samples) * 1000
+    return {
+        "p50_ms": round(float(np.percentile(samples, 50)), 4),
+        "p99_ms": round(float(np.percentile(samples, 99)), 4),
+        "mean_ms": round(float(samples.mean()), 4),
+    }
+
+
+def throughput(fn, profiles, chunk):
+    start = time.perf_counter()
+    for i in range(0, len(profiles), chunk):
+        fn(profiles[i:i + chunk])
+    return round(len(profiles) / (time.perf_counter() - start), 1)
+
+
+# ===================== ONE CATALOG SIZE =====================
+def bench_size(model, n, workdir, queries, batch):
+    result = {"careers": n}
+    csv_path = os.path.join(workdir, f"synthetic-{n}.csv")
+    df, seconds = timed(lambda: model.catalog(n))
+    result["generate_s"] = round(seconds, 4)
+    write_catalog(df, csv_path)
+    del df
+
+    build = {}
+    df, build["ingest_csv_s"] = timed(lambda: load_catalog(csv_path))
+    ccat = os.path.join(workdir, f"synthetic-{n}.ccat")
+    _, build["compile_s"] = timed(lambda: compile_catalog(csv_path, ccat))
+    _, build["open_compiled_s"] = timed(lambda: CompiledCatalog(ccat).engine)
+    engine, build["engine_s"] = timed(lambda: SkillScoringEngine.from_skills(df["Required_Skills"]))
+    tfidf, build["tfidf_fit_s"] = timed(lambda: TfidfModel.fit([canonical_text(r) for r in df["Required_Skills"]]))
+    _, build["rule_index_s"] = timed(lambda: engine.index)
+    hybrid, build["hybrid_kernel_s"] = timed(lambda: HybridKernel(engine, tfidf))
+    _, build["hybrid_index_s"] = timed(lambda: hybrid.index)
+    lsh, build["lsh_index_s"] = timed(lambda: MinHashLSH(engine))
+    result["build"] = {k: round(v, 4) for k, v in build.items()}
+    result["n_skills"] = engine.n_skills
+
+    def hybrid_full(q):
+        # reference: the old two-pass 0.7 / 0.3 blend over every career
+        scores = 0.7 * engine.score(q) + 0.3 * tfidf.similarity(canonical_text(q)) * 100
+        return top_k_rows(scores[None, :], 10)[0]
+
+    result["query"] = {
+        "match_score": latency(engine.score, queries),
+        "rule_top10": latency(lambda q: engine.top_k(q, 10), queries),
+        "tfidf_similarity": latency(lambda q: tfidf.similarity(canonical_text(q)), queries),
+        "hybrid_full_top10": latency(hybrid_full, queries),
+        "hybrid_fused_top10": latency(lambda q: top_k_rows(hybrid.score(q)[None, :], 10)[0], queries),
+        "hybrid_index_top10": latency(lambda q: hybrid.top_k(q, 10), queries),
+        "lsh_top10": latency(lambda q: lsh.top_k(q, 10), queries),
+    }
+    result["lsh_recall_at_10"] = round(recall_at_k(lsh, queries, 10), 4)
+
+    recommender = Recommender(df, engine, tfidf)
+    chunk = max(1, min(len(batch), BATCH_CELLS // n))
+    result["batch_profiles_per_s"] = {
+        "rule": throughput(lambda p: recommender.recommend_many(p, 3, "rule"), batch, chunk),
+        "hybrid": throughput(lambda p: recommender.recommend_many(p, 3, "hybrid"), batch, chunk),
+    }
+    result["batch_chunk"] = chunk
+    return result
+
+
+# ===================== REPORTING =====================
+def git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def flatten(prefix, value, out):
+    if isinstance(value, dict):
+        for k, v in value.items():
+            flatten(f"{prefix}.{k}" if prefix else k, v, out)
+    elif isinstance(value, (int, float)):
+        out[prefix] = value
+    return out
+
+
+def compare(old, new):
+    # lower is better for times, higher for throughput
+    old_sizes = {r["careers"]: r for r in old["results"]}
+    for r in new["results"]:
+        base = old_sizes.get(r["careers"])
+        if base is None:
+            continue
+        a, b = flatten("", base, {}), flatten("", r, {})
+        print(f"--- {r['careers']} careers (vs {str(old.get('commit'))[:10]})")
+        for key in sorted(b):
+            if key in a and a[key] and key not in ("careers", "n_skills", "batch_chunk"):
+                print(f"{key:40s} {a[key]:>12.4f} -> {b[key]:>12.4f}  x{b[key] / a[key]:.2f}")
+
+
+def print_result(r):
+    q = r["query"]
+    print(f"{r['careers']:>9} careers  {r['n_skills']:>6} skills  "
+          f"build {sum(r['build'].values()):.2f}s  "
+          f"rule top10 p50 {q['rule_top10']['p50_ms']:.3f}ms  "
+          f"hybrid index top10 p50 {q['hybrid_index_top10']['p50_ms']:.3f}ms / p99 {q['hybrid_index_top10']['p99_ms']:.3f}ms  "
+          f"lsh top10 p50 {q['lsh_top10']['p50_ms']:.3f}ms (recall@10 {r['lsh_recall_at_10']:.3f})  "
+          f"batch {r['batch_profiles_per_s']['rule']:.0f}/s rule", file=sys.stderr)
+
+
+# ===================== CLI =====================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the scoring paths on synthetic catalogs.")
+    parser.add_argument("--sizes", default=",".join(str(n) for n in SIZES))
+    parser.add_argument("--queries", type=int, default=200, help="single queries per size")
+    parser.add_argument("--batch", type=int, default=2048, help="profiles for the throughput run")
+    parser.add_argument("-o", "--output", help="JSON results file (default: benchmark-<commit>.json)")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    parser.add_argument("--workdir", help="where to keep the generated catalogs (default: a temp dir)")
+    args = parser.parse_args(argv)
+
+    model = SkillModel.from_csv()
+    queries = model.profiles(args.queries, seed=1)
+    batch = model.profiles(args.batch, seed=2)
+    commit = git_commit()
+    report = {
+        "commit": commit,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "results": [],
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = args.workdir or tmp
+        os.makedirs(workdir, exist_ok=True)
+        for n in (int(s) for s in args.sizes.split(",")):
+            result = bench_size(model, n, workdir, queries, batch)
+            print_result(result)
+            report["results"].append(result)
+
+    output = args.output or f"benchmark-{(commit or 'local')[:10]}.json"
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"wrote {output}", file=sys.stderr)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(json.load(f), report)
+
+
+if __name__ == "__main__":
+    main()
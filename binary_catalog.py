@@ -0,0 +1,321 @@
+# ===================== IMPORTS =====================
+import hashlib
+import json
+import mmap
+import os
+import re
+import tempfile
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from catalog import CATALOG_PATH, clean_catalog
+from scoring_engine import SkillScoringEngine
+from skill_vocab import SkillVocabulary
+
+# Compiled catalog layout (little endian):
+#   b"CCAT" | u32 format version | u64 header length | JSON header | sections
+# Every section is a raw numpy array aligned to 64 bytes; the header records
+# its dtype, shape and offset so the loader can view it straight out of mmap.
+#
+# The CSV is compiled CHUNK_ROWS rows at a time. Each section is appended to
+# its own temporary file and copied into place once the sizes are known, so
+# memory does not grow with the catalog (only the skill vocabulary is kept).
+
+MAGIC = b"CCAT"
+FORMAT_VERSION = 2
+ALIGN = 64
+CHUNK_ROWS = 50_000
+COPY_ITEMS = 1 << 20
+TEXT_COLUMNS = ["Career", "Required_Skills", "Image", "Description", "Learn_Link", "Salary"]
+SALARY_RANGE = re.compile(r"(\d+(?:\.\d+)?)\s*(?:-|–|to)\s*(\d+(?:\.\d+)?)")
+SALARY_SINGLE = re.compile(r"(\d+(?:\.\d+)?)")
+
+
+# ===================== HELPERS =====================
+def file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def parse_salary(text):
+    # "₹6-10 LPA" -> (6.0, 10.0); unparsable -> (nan, nan)
+    m = SALARY_RANGE.search(text)
+    if m:
+        return float(m.group(1)), float(m.group(2))
+    m = SALARY_SINGLE.search(text)
+    if m:
+        return float(m.group(1)), float(m.group(1))
+    return float("nan"), float("nan")
+
+
+def encode_strings(values):
+    encoded = [v.encode("utf-8") for v in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    blob = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+    return offsets, blob
+
+
+def validate(df, path):
+    absent = [c for c in TEXT_COLUMNS if c not in df.columns]
+    if absent:
+        raise ValueError(f"{path}: missing column(s) {', '.join(absent)}")
+    for col in ("Career", "Required_Skills"):
+        bad = df.index[df[col].isna() | (df[col].astype(str).str.strip() == "")]
+        if len(bad):
+            raise ValueError(f"{path}: empty {col} in row(s) {', '.join(str(i + 2) for i in bad[:10])}")
+
+
+# ===================== STRING COLUMN =====================
+class StringColumn:
+    """Lazily decoded view over an offsets + utf-8 blob pair."""
+
+    def __init__(self, offsets, blob):
+        self.offsets = offsets
+        self.blob = blob
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        return bytes(self.blob[self.offsets[i]:self.offsets[i + 1]]).decode("utf-8")
+
+    def take(self, ids):
+        return [self[int(i)] for i in ids]
+
+    def tolist(self):
+        return self.take(range(len(self)))
+
+
+# ===================== COMPILE =====================
+class _Spill:
+    """Sections of a catalog being compiled, each appended to a temporary file."""
+
+    def __init__(self, directory, names):
+        self.files = {name: open(os.path.join(directory, name), "w+b") for name in names}
+        self.dtypes = {}
+        self.sizes = dict.fromkeys(names, 0)
+
+    def write(self, name, arr):
+        arr = np.ascontiguousarray(arr)
+        self.dtypes.setdefault(name, arr.dtype)
+        self.files[name].write(arr.astype(self.dtypes[name], copy=False).tobytes())
+        self.sizes[name] += len(arr)
+
+    def write_strings(self, name, values, start=0):
+        # appends to a string section whose blob so far holds `start` bytes
+        offsets, blob = encode_strings(values)
+        if start == 0 and not self.sizes[f"{name}.offsets"]:
+            self.write(f"{name}.offsets", offsets)
+        else:
+            self.write(f"{name}.offsets", offsets[1:] + start)
+        self.write(f"{name}.blob", blob)
+        return start + len(blob)
+
+    def copy(self, name, out, dtype):
+        # the section as `dtype`, COPY_ITEMS at a time
+        f = self.files[name]
+        f.seek(0)
+        while True:
+            block = np.fromfile(f, dtype=self.dtypes[name], count=COPY_ITEMS)
+            if not len(block):
+                return
+            out.write(block.astype(dtype, copy=False).tobytes())
+
+    def close(self):
+        for f in self.files.values():
+            f.close()
+
+
+def compile_catalog(csv_path, out_path, chunk_size=CHUNK_ROWS):
+    names = ["skill_indptr", "skill_indices", "salary_min", "salary_max"]
+    for col in ["skills", "display", "labels"] + TEXT_COLUMNS:
+        names += [f"{col}.offsets", f"{col}.blob"]
+    os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(out_path) or ".") as tmp_dir:
+        spill = _Spill(tmp_dir, names)
+        try:
+            vocab = SkillVocabulary()
+            n_careers = nnz = 0
+            ends = dict.fromkeys(TEXT_COLUMNS, 0)
+            spill.write("skill_indptr", np.zeros(1, dtype=np.int64))
+            for chunk in pd.read_csv(csv_path, encoding="latin1", chunksize=chunk_size):
+                chunk = clean_catalog(chunk)
+                validate(chunk, csv_path)
+                chunk = chunk[TEXT_COLUMNS].fillna("").astype(str)
+
+                # same ids and row order as SkillScoringEngine.from_skills()
+                ids = [sorted({vocab.intern(s) for s in req.split(",") if s.strip()})
+                       for req in chunk["Required_Skills"]]
+                counts = np.array([len(row) for row in ids], dtype=np.int64)
+                spill.write("skill_indptr", nnz + np.cumsum(counts))
+                spill.write("skill_indices", np.fromiter(chain.from_iterable(ids), np.int64, int(counts.sum())))
+                nnz += int(counts.sum())
+
+                salaries = np.array([parse_salary(s) for s in chunk["Salary"]], dtype=np.float64).reshape(-1, 2)
+                spill.write("salary_min", salaries[:, 0])
+                spill.write("salary_max", salaries[:, 1])
+                for col in TEXT_COLUMNS:
+                    ends[col] = spill.write_strings(col, chunk[col], ends[col])
+                n_careers += len(chunk)
+
+            for col in TEXT_COLUMNS:
+                if not spill.sizes[f"{col}.offsets"]:
+                    spill.write_strings(col, [])
+            spill.write("skill_indices", np.zeros(0, dtype=np.int64))
+            spill.write_strings("skills", vocab.names)
+            spill.write_strings("display", vocab.display)
+            spill.write_strings("labels", sorted(vocab.display))
+
+            index_dtype = np.dtype(np.int32 if nnz < 2 ** 31 else np.int64)
+            dtypes = dict(spill.dtypes, skill_indptr=index_dtype, skill_indices=index_dtype)
+            stat = os.stat(csv_path)
+            header = {
+                "format_version": FORMAT_VERSION,
+                "source": os.path.abspath(csv_path),
+                "source_sha256": file_sha256(csv_path),
+                "source_size": stat.st_size,
+                "source_mtime_ns": stat.st_mtime_ns,
+                "n_careers": n_careers,
+                "n_skills": len(vocab),
+                "sections": {},
+            }
+
+            # offsets depend on the header length, so lay out once with a placeholder
+            # header, then again with the real one until the length is stable
+            header_len = 0
+            while True:
+                offset = _aligned(len(MAGIC) + 4 + 8 + header_len)
+                for name in names:
+                    header["sections"][name] = {"dtype": dtypes[name].str, "shape": [spill.sizes[name]],
+                                                "offset": offset}
+                    offset = _aligned(offset + spill.sizes[name] * dtypes[name].itemsize)
+                raw = json.dumps(header).encode("utf-8")
+                if len(raw) == header_len:
+                    break
+                header_len = len(raw)
+
+            tmp = out_path + ".tmp"
+            with open(tmp, "wb") as f:
+                f.write(MAGIC)
+                f.write(np.uint32(FORMAT_VERSION).tobytes())
+                f.write(np.uint64(header_len).tobytes())
+                f.write(raw)
+                for name in names:
+                    f.write(b"\x00" * (header["sections"][name]["offset"] - f.tell()))
+                    spill.copy(name, f, dtypes[name])
+        finally:
+            spill.close()
+    os.replace(tmp, out_path)
+    return out_path
+
+
+def _aligned(n):
+    return (n + ALIGN - 1) // ALIGN * ALIGN
+
+
+# ===================== COMPILED CATALOG =====================
+class CompiledCatalog:
+    """Read-only catalog mapped from a compiled ``.ccat`` file."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:4] != MAGIC:
+            raise ValueError(f"{path}: not a compiled catalog")
+        version = int(np.frombuffer(self._mm, np.uint32, 1, 4)[0])
+        if version != FORMAT_VERSION:
+            raise ValueError(f"{path}: format version {version}, expected {FORMAT_VERSION}")
+        header_len = int(np.frombuffer(self._mm, np.uint64, 1, 8)[0])
+        self.header = json.loads(self._mm[16:16 + header_len].decode("utf-8"))
+        self.n_careers = self.header["n_careers"]
+        self.n_skills = self.header["n_skills"]
+        self.columns = {col: self._strings(col) for col in TEXT_COLUMNS}
+        self._engine = None
+
+    def _array(self, name):
+        spec = self.header["sections"][name]
+        count = int(np.prod(spec["shape"]))
+        return np.frombuffer(self._mm, np.dtype(spec["dtype"]), count, spec["offset"]).reshape(spec["shape"])
+
+    def _strings(self, name):
+        return StringColumn(self._array(f"{name}.offsets"), self._array(f"{name}.blob"))
+
+    # ---------- derived views ----------
+    @property
+    def skill_labels(self):
+        return self._strings("labels").tolist()
+
+    @property
+    def salary_range(self):
+        return self._array("salary_min"), self._array("salary_max")
+
+    @property
+    def engine(self):
+        if self._engine is None:
+            indptr = self._array("skill_indptr")
+            indices = self._array("skill_indices")
+            matrix = sparse.csr_matrix(
+                (np.ones(len(indices), dtype=np.float64), indices, indptr),
+                shape=(self.n_careers, self.n_skills), copy=False
+            )
+            matrix.has_sorted_indices = True
+            vocab = SkillVocabulary.from_names(self._strings("skills").tolist(), self._strings("display").tolist())
+            self._engine = SkillScoringEngine(vocab, matrix)
+        return self._engine
+
+    def rows(self, ids):
+        # only the requested careers are decoded, e.g. the top-k for display
+        return pd.DataFrame({col: self.columns[col].take(ids) for col in TEXT_COLUMNS})
+
+    def to_frame(self):
+        return self.rows(range(self.n_careers))
+
+    def is_fresh(self, csv_path):
+        try:
+            stat = os.stat(csv_path)
+        except OSError:
+            return False
+        return (
+            stat.st_size == self.header["source_size"]
+            and stat.st_mtime_ns == self.header["source_mtime_ns"]
+        )
+
+
+# ===================== OPEN OR COMPILE =====================
+def compiled_path(csv_path, artifact_dir="artifacts"):
+    name = os.path.splitext(os.path.basename(csv_path))[0]
+    return os.path.join(artifact_dir, f"{name}.v{FORMAT_VERSION}.ccat")
+
+
+def open_catalog(csv_path=CATALOG_PATH, artifact_dir="artifacts"):
+    out_path = compiled_path(csv_path, artifact_dir)
+    if os.path.exists(out_path):
+        try:
+            catalog = CompiledCatalog(out_path)
+            if catalog.is_fresh(csv_path):
+                return catalog
+        except (OSError, ValueError, KeyError):
+            pass  # corrupt or outdated artifact, recompile below
+    compile_catalog(csv_path, out_path)
+    return CompiledCatalog(out_path)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Validate and compile the careers CSV into a binary catalog.")
+    parser.add_argument("csv", nargs="?", default=CATALOG_PATH)
+    parser.add_argument("-o", "--output")
+    args = parser.parse_args()
+    out = compile_catalog(args.csv, args.output or compiled_path(args.csv))
+    catalog = CompiledCatalog(out)
+    print(f"compiled {catalog.n_careers} careers, {catalog.n_skills} skills -> {out}")
@@ -0,0 +1,148 @@
+# ===================== IMPORTS =====================
+import argparse
+import os
+import re
+import sys
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from batch_score import read_profiles
+from catalog import CATALOG_PATH
+from recommender import MODES, Recommender
+from report import generate_pdf
+from report_cache import ReportCache, catalog_version, report_key
+
+# Roadmap PDFs for a whole cohort in one ZIP.
+#
+#   python bulk_export.py roster.csv -o reports.zip --workers 8
+#
+# Profiles are scored in chunks in this process, the PDFs are rendered by a
+# process pool, and each finished batch is appended to the archive right away.
+# Only a bounded number of batches is ever in flight, so memory does not grow
+# with the size of the roster. Identical skill sets are rendered once.
+
+
+# ===================== RENDERING =====================
+def render_batch(batch):
+    # runs in a worker process: [(name, key, skills, rows, missing)] -> [(name, key, pdf)]
+    return [(name, key, generate_pdf(rows, skills, missing)) for name, key, skills, rows, missing in batch]
+
+
+def entry_name(profile_id, seen):
+    name = re.sub(r"[^\w.-]+", "_", profile_id).strip("._") or "profile"
+    if name in seen:
+        n = 2
+        while f"{name}-{n}" in seen:
+            n += 1
+        name = f"{name}-{n}"
+    seen.add(name)
+    return f"{name}.pdf"
+
+
+def build_jobs(recommender, chunks, top_k, mode):
+    # -> (zip entry name, cache key, skills, report rows, skill gaps) per profile
+    version = catalog_version(recommender.df)
+    descriptions = recommender.df["Description"].tolist()
+    seen = set()
+    for chunk in chunks:
+        profiles = [p[1] for p in chunk]
+        top, scores = recommender.top_many(profiles, top_k, mode)
+        for i, (profile_id, skills) in enumerate(chunk):
+            user_ids = set(recommender.engine.user_ids(skills).tolist())
+            results = [recommender.describe(c, s, user_ids) for c, s in zip(top[i], scores[i])]
+            rows = [
+                {"Career": r["career"], "Match_Score": r["match_score"], "Description": descriptions[c]}
+                for r, c in zip(results, top[i])
+            ]
+            yield (entry_name(profile_id, seen), report_key(skills, version), skills,
+                   rows, [r["missing_skills"] for r in results])
+
+
+# ===================== PROGRESS =====================
+class Progress:
+    def __init__(self, interval=1.0):
+        self.start = time.perf_counter()
+        self.last = self.start
+        self.interval = interval
+        self.done = 0
+        self.cached = 0
+
+    def update(self, n, cached=0):
+        self.done += n
+        self.cached += cached
+        now = time.perf_counter()
+        if now - self.last >= self.interval:
+            self.last = now
+            self.report("rendered")
+
+    def report(self, verb):
+        elapsed = time.perf_counter() - self.start
+        print(f"{verb} {self.done} reports ({self.cached} from cache) "
+              f"in {elapsed:.1f}s ({self.done / max(elapsed, 1e-9):.0f}/s)", file=sys.stderr)
+
+
+# ===================== EXPORT =====================
+def export(jobs, out, workers, batch_size, cache, progress):
+    with zipfile.ZipFile(out, "w", compression=zipfile.ZIP_DEFLATED) as zf, \
+            ProcessPoolExecutor(max_workers=workers) as pool:
+        inflight = deque()
+
+        def drain():
+            written = inflight.popleft().result()
+            for name, key, pdf in written:
+                zf.writestr(name, pdf)
+                cache.put(key, pdf)
+            progress.update(len(written))
+
+        batch = []
+        for job in jobs:
+            name, key = job[0], job[1]
+            pdf = cache.get(key)
+            if pdf is not None:
+                zf.writestr(name, pdf)
+                progress.update(1, cached=1)
+                continue
+            batch.append(job)
+            if len(batch) == batch_size:
+                inflight.append(pool.submit(render_batch, batch))
+                batch = []
+                if len(inflight) >= 2 * workers:
+                    drain()
+        if batch:
+            inflight.append(pool.submit(render_batch, batch))
+        while inflight:
+            drain()
+
+
+def run(args):
+    recommender = Recommender.load(args.catalog, hybrid=args.mode == "hybrid")
+    chunks = read_profiles(args.profiles, args.id_column, args.skills_column, args.chunk_size)
+    jobs = build_jobs(recommender, chunks, args.top_k, args.mode)
+    cache = ReportCache(max_bytes=args.cache_mb * 2 ** 20)
+    progress = Progress()
+    out = sys.stdout.buffer if args.output == "-" else args.output
+    export(jobs, out, args.workers, args.batch_size, cache, progress)
+    progress.report("wrote")
+
+
+# ===================== CLI =====================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render roadmap PDFs for a cohort of skill profiles into a ZIP.")
+    parser.add_argument("profiles", help="CSV file with a skills column")
+    parser.add_argument("-o", "--output", default="reports.zip", help="ZIP file to write, '-' for stdout")
+    parser.add_argument("--catalog", default=CATALOG_PATH)
+    parser.add_argument("--mode", choices=MODES, default="rule")
+    parser.add_argument("--top-k", type=int, default=5, help="careers per report")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--batch-size", type=int, default=16, help="reports per worker task")
+    parser.add_argument("--chunk-size", type=int, default=512, help="profiles scored at a time")
+    parser.add_argument("--cache-mb", type=int, default=64, help="memory for reusing identical reports")
+    parser.add_argument("--id-column", default="id")
+    parser.add_argument("--skills-column", default="skills")
+    run(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,14 @@ import pandas as pd
 import plotly.express as px
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
+from catalog import CATALOG_PATH, badge, missing
+from skill_vocab import canonical_set, canonical_skills, canonical_text
+from charts import cached_figure, chart_key
+from progressive import reserve
+from data_layer import load_data
+from metrics import Run, debug_panel, debug_requested
+from result_cache import Result, ResultCache, result_key
+from disk_cache import DiskCache
 
 # ===================== PAGE CONFIG =====================
 st.set_page_config(
@@ -59,65 +67,58 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# ===================== LOAD CSV DATA =====================
-df = pd.read_csv("career_dataset_100.csv",encoding="latin1")
-df["Salary"] = (
-    df["Salary"]
-    .astype(str)
-    .str.replace("–", "-", regex=False)
-)
+# ===================== LOAD CATALOG (SHARED ACROSS SESSIONS) =====================
+debug = debug_requested()
+run = Run("rule", trace_memory=debug)
+data, load_info = load_data(CATALOG_PATH)
+catalog = data.catalog
+engine = data.engine
+run.lap("load")
 
-# Rupees symbol forcefully add
-df["Salary"] = "₹" + df["Salary"]
-df.columns = df.columns.str.strip()
+@st.cache_resource
+def load_result_cache():
+    # memory first, then the SQLite tier shared with the other app processes
+    return ResultCache(backing=DiskCache())
 
-# ===================== FIXED MATCH LOGIC =====================
-def match_score(user_skills, required_skills):
-    user = set(s.lower() for s in user_skills)
-    req = set(s.strip().lower() for s in required_skills.split(","))
-    return (len(user & req) / len(req)) * 100 if req else 0
+def rank_careers(user_skills):
+    top_ids, top_scores = engine.top_k(user_skills, 10)
+    gaps = [missing(user_skills, req) for req in catalog.rows(top_ids)["Required_Skills"]]
+    return Result(top_ids, top_scores, gaps)
 
 # ===================== OTHER FUNCTIONS (UNCHANGED) =====================
-def badge(score):
-    if score >= 80:
-        return "🏆 Excellent Fit"
-    elif score >= 60:
-        return "🔥 Good Fit"
-    else:
-        return "⚠️ Needs Improvement"
-
-def missing(user_set, req):
-    user_lower = set(s.lower() for s in user_set)
-    req_lower = set(s.strip().lower() for s in req.split(","))
-    return req_lower - user_lower
-
 def radar_chart(row, user_set):
-    req = set(s.strip().lower() for s in row["Required_Skills"].split(","))
-    skills = list(req | set(s.lower() for s in user_set))
-    df_radar = pd.DataFrame({
-        "Skill": skills * 2,
-        "Value": [1 if s in set(x.lower() for x in user_set) else 0 for s in skills] +
-                 [1 if s in req else 0 for s in skills],
-        "Type": ["You"]*len(skills) + ["Required"]*len(skills)
-    })
-    fig = px.line_polar(
-        df_radar,
-        r="Value",
-        theta="Skill",
-        color="Type",
-        line_close=True,
-        color_discrete_sequence=px.colors.sequential.Plasma
-    )
-    fig.update_traces(fill="toself", marker_size=6)
-    fig.update_layout(margin=dict(l=30,r=30,t=30,b=30))
+    req = canonical_skills(row["Required_Skills"])
+    user = canonical_set(user_set)
+
+    def build():
+        skills = list(req | user)
+        df_radar = pd.DataFrame({
+            "Skill": skills * 2,
+            "Value": [1 if s in user else 0 for s in skills] +
+                     [1 if s in req else 0 for s in skills],
+            "Type": ["You"]*len(skills) + ["Required"]*len(skills)
+        })
+        fig = px.line_polar(
+            df_radar,
+            r="Value",
+            theta="Skill",
+            color="Type",
+            line_close=True,
+            color_discrete_sequence=px.colors.sequential.Plasma
+        )
+        fig.update_traces(fill="toself", marker_size=6)
+        return fig.update_layout(margin=dict(l=30,r=30,t=30,b=30))
+
+    fig = cached_figure(("rule.radar", canonical_text(req), canonical_text(user)), build)
     st.plotly_chart(fig, use_container_width=True)
 
 # ===================== UI =====================
 st.title("🎯 Career Guide AI")
 st.write("AI-powered career recommendation with skill gap analysis")
 
-all_skills = sorted({skill.strip() for req in df['Required_Skills'] for skill in req.split(',')})
+all_skills = data.skill_labels
 user_skills = set(st.multiselect("🧠 Select your skills", all_skills, default=["Python","SQL","HTML"]))
+run.skip()
 
 if st.button("🚀 Analyze My Career"):
 
@@ -125,19 +126,22 @@ if st.button("🚀 Analyze My Career"):
         st.warning("⚠️ Please select at least one skill!")
     else:
         # ✅ FIXED SCORE (NO TF-IDF)
-        df["Match_Score"] = df["Required_Skills"].apply(
-            lambda x: match_score(user_skills, x)
-        )
-
-        df = df.sort_values("Match_Score", ascending=False).reset_index(drop=True)
+        # top-10 straight from the skill index, no full-catalog sort;
+        # repeated skill sets are served from the shared result cache
+        key = result_key(engine.user_ids(user_skills), data.version, "rule", 10)
+        result = load_result_cache().get_or_compute(key, lambda: rank_careers(user_skills))
+        run.lap("score")
+        df = catalog.rows(list(result.ids))
+        df["Match_Score"] = result.scores
+        run.lap("rank")
 
         # ===================== TOP 3 CARDS =====================
         st.markdown("## 🏆 Top 3 Matches")
         c1, c2, c3 = st.columns(3)
 
-        for col, (_, row) in zip([c1, c2, c3], df.head(3).iterrows()):
+        for col, (i, row) in zip([c1, c2, c3], df.head(3).iterrows()):
             with col:
-                miss = missing(user_skills, row["Required_Skills"])
+                miss = result.gaps[i]
                 miss_text = " • ".join(skill.title() for skill in miss) if miss else ""
 
                 # salary html (clean)
@@ -173,55 +177,69 @@ if st.button("🚀 Analyze My Career"):
                 </div>
                 """, unsafe_allow_html=True)
 
+        run.lap("cards")
+
         # ===================== ANALYTICS =====================
         st.markdown("---")
 
-        st.markdown("### 📊 Career Match Overview")
-        top7 = df.head(7)
-        fig_bar = px.bar(
-            top7,
-            x="Match_Score",
-            y="Career",
-            orientation="h",
-            color="Match_Score",
-            color_continuous_scale=px.colors.sequential.Plasma,
-            text=top7["Match_Score"].apply(lambda x: f"{x:.2f}%")
-        )
-        fig_bar.update_layout(yaxis={'categoryorder': 'total ascending'}, height=400)
-        st.plotly_chart(fig_bar, use_container_width=True)
-
-        st.markdown("### 🎯 Deep Dive: Top Career")
-        radar_chart(df.iloc[0], user_skills)
-
-        st.markdown("### 🥇🥈🥉 Top 3 Career Match Distribution")
-        top3 = df.head(3).sort_values("Match_Score", ascending=False)
-        fig_pie = px.pie(
-            top3,
-            names='Career',
-            values='Match_Score',
-            color='Career',
-            color_discrete_sequence=px.colors.qualitative.Bold,
-            hole=0.4
-        )
-        fig_pie.update_traces(
-            texttemplate=top3["Match_Score"].apply(lambda x: f"{x:.2f}%"),
-            textposition='inside'
-        )
-        st.plotly_chart(fig_pie, use_container_width=True)
-
-        st.markdown("### 📈 Top 10 Career Match Trend")
-        top10 = df.head(10)
-        fig_line = px.line(
-            top10,
-            x='Career',
-            y='Match_Score',
-            markers=True,
-            text=top10['Match_Score'].apply(lambda x: f"{x:.2f}%"),
-            color_discrete_sequence=['#ff5722']
-        )
-        fig_line.update_traces(marker=dict(size=10))
-        st.plotly_chart(fig_line, use_container_width=True)
+        # the cards above are already on screen; the charts fill these slots in order
+        bar_slot, radar_slot, pie_slot, line_slot = reserve(
+            "match overview", "skill gap radar", "top 3 distribution", "match trend")
+
+        with bar_slot.container():
+            st.markdown("### 📊 Career Match Overview")
+            top7 = df.head(7)
+            fig_bar = cached_figure(chart_key("rule.bar", user_skills, data.version), lambda: px.bar(
+                top7,
+                x="Match_Score",
+                y="Career",
+                orientation="h",
+                color="Match_Score",
+                color_continuous_scale=px.colors.sequential.Plasma,
+                text=top7["Match_Score"].apply(lambda x: f"{x:.2f}%")
+            ).update_layout(yaxis={'categoryorder': 'total ascending'}, height=400))
+            st.plotly_chart(fig_bar, use_container_width=True)
+
+        with radar_slot.container():
+            st.markdown("### 🎯 Deep Dive: Top Career")
+            radar_chart(df.iloc[0], user_skills)
+
+        with pie_slot.container():
+            st.markdown("### 🥇🥈🥉 Top 3 Career Match Distribution")
+            top3 = df.head(3).sort_values("Match_Score", ascending=False)
+            fig_pie = cached_figure(chart_key("rule.pie", user_skills, data.version), lambda: px.pie(
+                top3,
+                names='Career',
+                values='Match_Score',
+                color='Career',
+                color_discrete_sequence=px.colors.qualitative.Bold,
+                hole=0.4
+            ).update_traces(
+                texttemplate=top3["Match_Score"].apply(lambda x: f"{x:.2f}%"),
+                textposition='inside'
+            ))
+            st.plotly_chart(fig_pie, use_container_width=True)
+
+        with line_slot.container():
+            st.markdown("### 📈 Top 10 Career Match Trend")
+            top10 = df.head(10)
+            fig_line = cached_figure(chart_key("rule.line", user_skills, data.version), lambda: px.line(
+                top10,
+                x='Career',
+                y='Match_Score',
+                markers=True,
+                text=top10['Match_Score'].apply(lambda x: f"{x:.2f}%"),
+                color_discrete_sequence=['#ff5722']
+            ).update_traces(marker=dict(size=10)))
+            st.plotly_chart(fig_line, use_container_width=True)
+        run.lap("charts")
 
 # ===================== FOOTER =====================
+run.finish()
 st.markdown("---")
+if debug:
+    debug_panel(run)
+    st.caption(load_info.describe())
+    st.caption(f"Result cache: {load_result_cache().stats()}")
+    st.caption(f"Disk cache: {load_result_cache().backing.stats()}")
 st.caption("Built with ❤️ by Rohit | Career Guide AI v5.5")
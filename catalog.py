@@ -0,0 +1,41 @@
+# ===================== IMPORTS =====================
+import pandas as pd
+
+from skill_vocab import canonical_set, canonical_skills
+
+CATALOG_PATH = "career_dataset_100.csv"
+
+
+# ===================== LOAD CSV DATA =====================
+def load_catalog(path=CATALOG_PATH):
+    return clean_catalog(pd.read_csv(path, encoding="latin1"))
+
+
+def clean_catalog(df):
+    # also applied chunk by chunk when the CSV is streamed
+    df["Salary"] = (
+        df["Salary"]
+        .astype(str)
+        .str.replace("–", "-", regex=False)
+    )
+
+    # Rupees symbol forcefully add
+    df["Salary"] = "₹" + df["Salary"]
+    df.columns = df.columns.str.strip()
+    return df
+
+
+# ===================== BADGE =====================
+def badge(score):
+    if score >= 80:
+        return "🏆 Excellent Fit"
+    elif score >= 60:
+        return "🔥 Good Fit"
+    else:
+        return "⚠️ Needs Improvement"
+
+
+# ===================== MISSING SKILLS =====================
+def missing(user_set, req):
+    # canonical names, so "Sklearn" covers a required "Scikit-learn"
+    return canonical_skills(req) - canonical_set(user_set)
@@ -0,0 +1,197 @@
+# ===================== IMPORTS =====================
+import argparse
+import csv
+import re
+import sys
+import time
+from collections import Counter
+
+from skill_vocab import canonical
+
+# Streaming ingester for raw catalog dumps such as career_data.csv.
+#
+#   python catalog_ingest.py career_data.csv -o artifacts/career_data.clean.csv --issues issues.csv
+#
+# Rows are read one at a time and written in chunks, so memory stays flat
+# however large the file is. Raw dumps often leave Required_Skills (and
+# sometimes Description) unquoted, so their commas spill into extra fields:
+#
+#   Data Analyst,Excel,SQL,...,Collect, process, and analyze data...,[Placeholder: ...],...
+#
+# The header says which columns exist; columns left and right of the free
+# text are taken from the ends of the row, and what remains is split between
+# skills and description (a description's continuation pieces start with a
+# space, skills after "," do not). Placeholders, HTML and other non-URLs in
+# Image / Learn_Link are blanked and flagged. Output uses the schema of
+# career_dataset_100.csv plus a Flags column.
+
+COLUMNS = ["Career", "Required_Skills", "Image", "Description", "Learn_Link", "Salary"]
+SPILL = ("Required_Skills", "Description")
+LINK_COLUMNS = ("Image", "Learn_Link")
+CHUNK_ROWS = 10_000
+PLACEHOLDER = re.compile(r"^\[\s*placeholder\s*:.*\]$", re.IGNORECASE)
+HTML = re.compile(r"<[a-z/][^>]*>", re.IGNORECASE)
+
+
+# ===================== SCHEMA =====================
+def read_header(header):
+    # "required_skills", " Description " -> the canonical column names
+    names = {c.lower(): c for c in COLUMNS}
+    columns = []
+    for raw in header:
+        name = names.get(raw.strip().lower())
+        if name is None:
+            raise ValueError(f"unknown column {raw.strip()!r}, expected some of {', '.join(COLUMNS)}")
+        columns.append(name)
+    for required in ("Career", "Required_Skills"):
+        if required not in columns:
+            raise ValueError(f"missing column {required}")
+    return columns
+
+
+# ===================== ROW REPAIR =====================
+def looks_like_link(value):
+    value = value.strip()
+    return value.startswith(("http://", "https://", "<")) or bool(PLACEHOLDER.match(value))
+
+
+def split_fields(fields, columns):
+    # -> ({column: raw value}, flags), or (None, flags) when the row cannot be placed
+    n = len(columns)
+    if len(fields) == n:
+        return dict(zip(columns, fields)), []
+    if len(fields) < n:
+        return None, ["short_row"]
+    spill = [i for i, c in enumerate(columns) if c in SPILL]
+    if not spill:
+        return None, ["too_many_fields"]
+    first, last = spill[0], spill[-1]
+    right = n - 1 - last
+    values = dict(zip(columns[:first], fields[:first]))
+    values.update(zip(columns[last + 1:], fields[len(fields) - right:]))
+    middle = fields[first:len(fields) - right]
+    inner = columns[first:last + 1]
+
+    if len(inner) == 1:
+        parts = {inner[0]: middle}
+    elif inner == ["Required_Skills", "Description"]:
+        # the description starts at the last field not continued by ", ..."
+        i = len(middle) - 1
+        while i > 1 and middle[i].startswith(" "):
+            i -= 1
+        parts = {"Required_Skills": middle[:i], "Description": middle[i:]}
+    elif len(inner) == 3 and inner[1] in LINK_COLUMNS:
+        # skills, one link column, description (or the reverse order)
+        j = next((j for j in range(1, len(middle) - 1) if looks_like_link(middle[j])), None)
+        if j is None:
+            return None, ["unrepairable"]
+        parts = {inner[0]: middle[:j], inner[1]: [middle[j]], inner[2]: middle[j + 1:]}
+    else:
+        return None, ["unrepairable"]
+
+    flags = []
+    for column, pieces in parts.items():
+        values[column] = ",".join(pieces)
+        if len(pieces) > 1:
+            flags.append(f"{column.lower()}_spill")
+    return values, flags
+
+
+def clean_skills(raw):
+    # trimmed, empty entries dropped, aliases of one skill kept once
+    seen = {}
+    for skill in raw.split(","):
+        skill = " ".join(skill.split())
+        if skill and canonical(skill) not in seen:
+            seen[canonical(skill)] = skill
+    return ",".join(seen.values())
+
+
+def normalize(values, flags):
+    row = {c: " ".join(values.get(c, "").split()) for c in COLUMNS}
+    row["Required_Skills"] = clean_skills(values.get("Required_Skills", ""))
+    if not row["Required_Skills"]:
+        flags.append("empty_skills")
+    for column in LINK_COLUMNS:
+        value = row[column]
+        if PLACEHOLDER.match(value):
+            flags.append(f"{column.lower()}_placeholder")
+        elif HTML.search(value):
+            flags.append(f"{column.lower()}_html")
+        elif value and not value.startswith(("http://", "https://")):
+            flags.append(f"{column.lower()}_invalid")
+        else:
+            continue
+        row[column] = ""
+    row["Flags"] = ";".join(flags)
+    return row
+
+
+# ===================== STREAMING =====================
+def ingest(src, out, issues=None, chunk_rows=CHUNK_ROWS, progress=None):
+    # src / out / issues are open text files; returns Counter of outcomes
+    reader = csv.reader(src)
+    columns = read_header(next(reader))
+    writer = csv.DictWriter(out, fieldnames=COLUMNS + ["Flags"])
+    writer.writeheader()
+    issue_writer = csv.writer(issues) if issues is not None else None
+    if issue_writer is not None:
+        issue_writer.writerow(["line", "career", "flags"])
+    counts = Counter()
+    chunk = []
+    for fields in reader:
+        if not any(f.strip() for f in fields):
+            continue
+        counts["rows_in"] += 1
+        values, flags = split_fields(fields, columns)
+        if values is not None:
+            row = normalize(values, flags)
+            chunk.append(row)
+        counts.update(flags)
+        if flags and issue_writer is not None:
+            career = values["Career"] if values is not None else (fields[0] if fields else "")
+            issue_writer.writerow([reader.line_num, career, ";".join(flags)])
+        if len(chunk) >= chunk_rows:
+            writer.writerows(chunk)
+            counts["rows_out"] += len(chunk)
+            chunk = []
+            if progress is not None:
+                progress(counts)
+    writer.writerows(chunk)
+    counts["rows_out"] += len(chunk)
+    counts["rows_skipped"] = counts["rows_in"] - counts["rows_out"]
+    return counts
+
+
+# ===================== CLI =====================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Repair and normalize a raw career catalog dump, streaming.")
+    parser.add_argument("source")
+    parser.add_argument("-o", "--output", required=True)
+    parser.add_argument("--issues", help="CSV of flagged rows (line, career, flags)")
+    parser.add_argument("--encoding", default="latin1", help="encoding of the source and output files")
+    args = parser.parse_args(argv)
+
+    start = last = time.perf_counter()
+
+    def progress(counts):
+        nonlocal last
+        now = time.perf_counter()
+        if now - last >= 1.0:
+            last = now
+            print(f"{counts['rows_in']} rows ({counts['rows_in'] / (now - start):.0f}/s)", file=sys.stderr)
+
+    issues = open(args.issues, "w", newline="", encoding="utf-8") if args.issues else None
+    try:
+        with open(args.source, newline="", encoding=args.encoding) as src, \
+                open(args.output, "w", newline="", encoding=args.encoding, errors="replace") as out:
+            counts = ingest(src, out, issues, progress=progress)
+    finally:
+        if issues is not None:
+            issues.close()
+    for key, n in sorted(counts.items()):
+        print(f"{key:28s} {n}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# ===================== IMPORTS =====================
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from skill_vocab import canonical_text
+
+# Plotly figures are rebuilt on every rerun, and the result only depends on
+# the skill set and the catalog version. They are memoized process-wide
+# (shared by all sessions, like the catalog cache in data_layer.py).
+# Charts over the whole catalog go through downsample() first, so the
+# browser never receives more than MAX_POINTS points per chart.
+
+MAX_POINTS = 40
+MAX_FIGURES = 512
+
+_lock = threading.Lock()
+_figures = OrderedDict()
+_stats = {"hits": 0, "misses": 0}
+
+
+# ===================== FIGURE CACHE =====================
+def chart_key(name, user_skills, version):
+    return name, canonical_text(user_skills), version
+
+
+def cached_figure(key, build):
+    with _lock:
+        fig = _figures.get(key)
+        if fig is not None:
+            _figures.move_to_end(key)
+            _stats["hits"] += 1
+            return fig
+        _stats["misses"] += 1
+    fig = build()
+    with _lock:
+        _figures[key] = fig
+        while len(_figures) > MAX_FIGURES:
+            _figures.popitem(last=False)
+    return fig
+
+
+def figure_stats():
+    with _lock:
+        return dict(_stats, entries=len(_figures))
+
+
+# ===================== DOWNSAMPLING =====================
+def downsample(df, label, value, max_points=MAX_POINTS):
+    # df is sorted best first. Above max_points, the first half is kept
+    # as-is and the rest is averaged into rank buckets ("#21–45"), so a
+    # score curve keeps its shape at a fixed number of points.
+    if len(df) <= max_points:
+        return df
+    head = max_points // 2
+    tail = df[value].to_numpy()[head:]
+    edges = np.unique(np.linspace(0, len(tail), max_points - head + 1).astype(int))
+    means = np.add.reduceat(tail, edges[:-1]) / np.diff(edges)
+    buckets = pd.DataFrame({
+        label: [f"#{head + a + 1}–{head + b}" for a, b in zip(edges[:-1], edges[1:])],
+        value: means,
+    })
+    return pd.concat([df[[label, value]].head(head), buckets], ignore_index=True)
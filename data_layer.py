@@ -0,0 +1,144 @@
+# ===================== IMPORTS =====================
+import os
+import threading
+import time
+
+from binary_catalog import file_sha256, open_catalog
+from hybrid_kernel import HybridKernel
+from skill_vocab import canonical_text
+from tfidf_model import load_or_fit
+
+# Process-wide catalog cache shared by every Streamlit session (sessions are
+# threads of one server process, and imported modules survive reruns).
+# An entry is reused while the source file's size and mtime are unchanged;
+# if they change but the content hash does not (e.g. a touch or a re-save),
+# it is kept as well. Only real edits rebuild.
+#
+# Hashing and building run outside the global lock, under a lock per
+# (path, builder), so a cold build never holds up sessions reading other
+# files. While a changed file is rebuilt, sessions keep the previous version
+# instead of waiting for the new one. The builder gets that previous version
+# so it can reuse whatever the edit did not touch.
+
+_lock = threading.Lock()  # guards _entries, _building and _stats only
+_entries = {}
+_building = {}
+_stats = {"hits": 0, "misses": 0}
+
+
+# ===================== CATALOG DATA =====================
+class CatalogData:
+    """Catalog plus everything derived from it, built once per file version."""
+
+    def __init__(self, path, previous=None):
+        self.path = path
+        self.catalog = open_catalog(path)
+        self.engine = self.catalog.engine
+        self.skill_labels = self.catalog.skill_labels
+        self.version = self.catalog.header["source_sha256"]
+        self._lock = threading.Lock()
+        self._tfidf = None
+        self._hybrid = None
+        # an edit refits TF-IDF from the last version's model, re-tokenising changed rows only
+        self._previous_tfidf = previous._tfidf if previous is not None else None
+
+    @property
+    def tfidf(self):
+        with self._lock:
+            if self._tfidf is None:
+                skills = [canonical_text(req) for req in self.catalog.columns["Required_Skills"].tolist()]
+                self._tfidf = load_or_fit(skills, previous=self._previous_tfidf)
+                self._previous_tfidf = None
+            return self._tfidf
+
+    @property
+    def hybrid(self):
+        tfidf = self.tfidf
+        with self._lock:
+            if self._hybrid is None:
+                self._hybrid = HybridKernel(self.engine, tfidf)
+                self._hybrid.index  # built here, under the lock
+            return self._hybrid
+
+    @property
+    def hybrid_index(self):
+        return self.hybrid.index
+
+    def hybrid_query(self, user_skills):
+        return self.hybrid.query(user_skills)
+
+
+# ===================== CACHE =====================
+class LoadInfo:
+    # diagnostics for the ?debug=1 panel. build_seconds is what this process
+    # paid for the entry, which is only an open() when the compiled catalog
+    # already existed on disk, so it is no measure of the CSV path
+    def __init__(self, hit, seconds, build_seconds):
+        self.hit = hit
+        self.seconds = seconds
+        self.build_seconds = build_seconds
+
+    def describe(self):
+        if self.hit:
+            return (f"⚡ Catalog from shared cache in {self.seconds * 1000:.1f} ms "
+                    f"(built in {self.build_seconds * 1000:.0f} ms)")
+        return f"📦 Catalog built in {self.seconds * 1000:.0f} ms"
+
+
+class _Entry:
+    def __init__(self, value, stamp, sha256, build_seconds):
+        self.value = value
+        self.stamp = stamp
+        self.sha256 = sha256
+        self.build_seconds = build_seconds
+
+
+def _stamp(path):
+    st = os.stat(path)
+    return st.st_size, st.st_mtime_ns
+
+
+def get_or_build(path, builder=CatalogData):
+    start = time.perf_counter()
+    key = (os.path.abspath(path), builder)
+    stamp = _stamp(path)
+    with _lock:
+        entry = _entries.get(key)
+        building = _building.setdefault(key, threading.Lock())
+    # only the first load waits for a build already in progress
+    if (entry is None or entry.stamp != stamp) and building.acquire(blocking=entry is None):
+        try:
+            with _lock:
+                entry = _entries.get(key)
+            if entry is None or entry.stamp != stamp:
+                sha256 = file_sha256(path)
+                if entry is None or entry.sha256 != sha256:
+                    value = builder(path, entry.value if entry is not None else None)
+                    build_seconds = time.perf_counter() - start
+                    with _lock:
+                        _entries[key] = _Entry(value, stamp, sha256, build_seconds)
+                        _stats["misses"] += 1
+                    return value, LoadInfo(False, build_seconds, build_seconds)
+                with _lock:
+                    entry.stamp = stamp  # touched but not edited
+        finally:
+            building.release()
+
+    info = LoadInfo(True, time.perf_counter() - start, entry.build_seconds)
+    with _lock:
+        _stats["hits"] += 1
+    return entry.value, info
+
+
+def load_data(path):
+    return get_or_build(path, CatalogData)
+
+
+def cache_stats():
+    with _lock:
+        return dict(_stats)
+
+
+def clear():
+    with _lock:
+        _entries.clear()
@@ -0,0 +1,171 @@
+# ===================== IMPORTS =====================
+import os
+import sqlite3
+import threading
+import time
+
+# Second cache tier shared by every app process on the machine. Several
+# Streamlit servers behind a load balancer each have their own in-process
+# caches; this SQLite file sits underneath them, so a result or report
+# computed by one worker is a disk read for all the others.
+#
+# WAL mode lets readers run concurrently with the single writer. Reads only
+# write back when the entry's access time is older than TOUCH_SECONDS, so
+# the LRU order is approximate but hits stay read-only. Hit/miss counters
+# are kept per process and added to the shared stats table in batches.
+# Entries older than the TTL (CAREER_CACHE_TTL seconds, a week by default)
+# are treated as misses and purged by the next write.
+
+CACHE_PATH = os.environ.get("CAREER_CACHE_DB", os.path.join("artifacts", "cache.sqlite"))
+TTL_SECONDS = float(os.environ.get("CAREER_CACHE_TTL", 7 * 24 * 3600))
+TOUCH_SECONDS = 60.0
+FLUSH_EVERY = 64  # lookups between stats flushes
+EVICT_BATCH = 64
+SCHEMA_VERSION = 2  # older files are dropped and recreated, it is only a cache
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    accessed REAL NOT NULL,
+    created REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+CREATE INDEX IF NOT EXISTS entries_created ON entries (created);
+CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL);
+INSERT OR IGNORE INTO meta VALUES ('bytes', 0);
+CREATE TABLE IF NOT EXISTS stats (kind TEXT PRIMARY KEY, hits INTEGER NOT NULL, misses INTEGER NOT NULL);
+"""
+
+
+# ===================== DISK CACHE =====================
+class DiskCache:
+    """Size-bounded SQLite store of bytes by (kind, key), safe across processes."""
+
+    def __init__(self, path=CACHE_PATH, max_bytes=256 * 2 ** 20, ttl=TTL_SECONDS):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._counts = {}  # kind -> [hits, misses], this process
+        self._pending = {}  # kind -> [hits, misses], not yet in the stats table
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        db = self._db()
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            if db.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                db.execute("DROP TABLE IF EXISTS entries")
+                db.execute("DROP TABLE IF EXISTS meta")
+                db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            for statement in _SCHEMA.split(";"):
+                if statement.strip():
+                    db.execute(statement)
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+
+    def _db(self):
+        # sqlite connections must not be shared between threads
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+        return db
+
+    def _count(self, kind, hit):
+        with self._lock:
+            for counts in (self._counts, self._pending):
+                counts.setdefault(kind, [0, 0])[0 if hit else 1] += 1
+            due = sum(h + m for h, m in self._pending.values()) >= FLUSH_EVERY
+        if due:
+            self.flush_stats()
+
+    def get(self, kind, key):
+        db = self._db()
+        now = time.time()
+        row = db.execute("SELECT value, accessed FROM entries WHERE key = ? AND kind = ? AND created >= ?",
+                         (key, kind, now - self.ttl)).fetchone()
+        self._count(kind, row is not None)
+        if row is None:
+            return None
+        if now - row[1] > TOUCH_SECONDS:
+            db.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+        return bytes(row[0])
+
+    def put(self, kind, key, value):
+        if len(value) > self.max_bytes:
+            return
+        db = self._db()
+        now = time.time()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            expired = db.execute("DELETE FROM entries WHERE created < ? RETURNING size", (now - self.ttl,)).fetchall()
+            old = db.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            db.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)",
+                       (key, kind, sqlite3.Binary(value), len(value), now, now))
+            change = len(value) - (old[0] if old else 0) - sum(size for size, in expired)
+            total = db.execute("UPDATE meta SET value = value + ? WHERE name = 'bytes' RETURNING value",
+                               (change,)).fetchone()[0]
+            while total > self.max_bytes:
+                oldest = db.execute("SELECT key, size FROM entries ORDER BY accessed LIMIT ?",
+                                    (EVICT_BATCH,)).fetchall()
+                if not oldest:
+                    # the running total drifted from the table; trust the table
+                    total = db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+                    db.execute("UPDATE meta SET value = ? WHERE name = 'bytes'", (total,))
+                    break
+                for old_key, size in oldest:
+                    if total <= self.max_bytes:
+                        break
+                    db.execute("DELETE FROM entries WHERE key = ?", (old_key,))
+                    total -= size
+                db.execute("UPDATE meta SET value = ? WHERE name = 'bytes'", (total,))
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+
+    def get_or_compute(self, kind, key, compute, dumps=bytes, loads=bytes):
+        data = self.get(kind, key)
+        if data is not None:
+            return loads(data)
+        value = compute()
+        self.put(kind, key, dumps(value))
+        return value
+
+    def flush_stats(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        with self._db() as db:
+            db.executemany(
+                "INSERT INTO stats VALUES (?, ?, ?) ON CONFLICT (kind) "
+                "DO UPDATE SET hits = hits + excluded.hits, misses = misses + excluded.misses",
+                [(kind, h, m) for kind, (h, m) in pending.items()],
+            )
+
+    def stats(self):
+        # this process, plus every process that has flushed into the file
+        self.flush_stats()
+        db = self._db()
+        shared = {kind: (h, m) for kind, h, m in db.execute("SELECT kind, hits, misses FROM stats")}
+        entries, size = db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        with self._lock:
+            local = {kind: tuple(c) for kind, c in self._counts.items()}
+
+        def rate(h, m):
+            return round(h / (h + m), 4) if h + m else 0.0
+
+        return {
+            "entries": entries,
+            "bytes": size,
+            "process": {kind: {"hits": h, "misses": m, "hit_rate": rate(h, m)} for kind, (h, m) in local.items()},
+            "shared": {kind: {"hits": h, "misses": m, "hit_rate": rate(h, m)} for kind, (h, m) in shared.items()},
+        }
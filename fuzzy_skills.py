@@ -0,0 +1,149 @@
+# ===================== IMPORTS =====================
+import time
+from collections import defaultdict
+
+import numpy as np
+
+from skill_vocab import canonical
+
+# Typo-tolerant skill lookup ("Pyhton" -> "python") over a precomputed
+# trigram index. Candidates are the skills sharing enough trigrams with the
+# typed token (q-gram count filter), checked best-first with a banded
+# Damerau-Levenshtein distance until the per-lookup time budget runs out.
+#
+# The budget covers candidate generation too. Posting lists are sorted by
+# skill length, so only the slice within k characters of the token is read,
+# rarest trigram first and CHUNK ids at a time, until MAX_READ ids have been
+# read or a quarter of the budget is spent; counting them is the other cost
+# that grows with the vocabulary. Lists not read to the end lower the count
+# filter accordingly, so a cut-short read can only lose candidates.
+
+Q = 3
+CHUNK = 1024
+MAX_READ = 8 * CHUNK
+
+
+# ===================== HELPERS =====================
+def trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + Q] for i in range(len(padded) - Q + 1)}
+
+
+def max_edits(token):
+    # very short tokens ("r", "c", "go") are too ambiguous to correct
+    if len(token) <= 2:
+        return 0
+    return 1 if len(token) <= 5 else 2
+
+
+def edit_distance(a, b, limit):
+    # optimal string alignment distance (adjacent swaps cost 1), gives up
+    # as soon as every cell in a row exceeds ``limit``
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    prev2 = None
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        best = cur[0]
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                cur[j] = min(cur[j], prev2[j - 2] + 1)
+            best = min(best, cur[j])
+        if best > limit:
+            return limit + 1
+        prev2, prev = prev, cur
+    return prev[-1]
+
+
+# ===================== RESOLVER =====================
+class FuzzySkillResolver:
+    def __init__(self, names, budget_ms=0.5):
+        self.names = sorted(set(names))
+        self.exact = {name: name for name in self.names}
+        self.lengths = np.array([len(n) for n in self.names])
+        self.budget = budget_ms / 1000
+        postings = defaultdict(list)
+        for i, name in enumerate(self.names):
+            for g in trigrams(name):
+                postings[g].append(i)
+        self.postings = {}
+        self.posting_lengths = {}
+        for g, ids in postings.items():
+            ids = np.asarray(ids, dtype=np.int32)
+            ids = ids[np.argsort(self.lengths[ids], kind="stable")]
+            self.postings[g] = ids
+            self.posting_lengths[g] = self.lengths[ids]
+        self.candidates("warm up", 2)  # first numpy calls are slow, keep them out of the budget
+
+    def candidates(self, token, k, deadline=None):
+        # only the postings of the token's trigrams are touched, never the
+        # whole vocabulary, and each one only within the length band
+        token_grams = trigrams(token)
+        grams = sorted((g for g in token_grams if g in self.postings), key=lambda g: len(self.postings[g]))
+        parts = []
+        complete = read = 0
+        for g in grams:
+            lengths = self.posting_lengths[g]
+            lo = np.searchsorted(lengths, len(token) - k, side="left")
+            hi = np.searchsorted(lengths, len(token) + k, side="right")
+            while lo < hi and read < MAX_READ and (deadline is None or time.perf_counter() < deadline):
+                parts.append(self.postings[g][lo:min(hi, lo + CHUNK)])
+                read += len(parts[-1])
+                lo += CHUNK
+            if lo < hi:
+                break
+            complete += 1
+        if not parts:
+            return np.empty(0, dtype=np.int32)
+        ids, shared = np.unique(np.concatenate(parts), return_counts=True)
+        # one edit changes at most Q trigrams, an adjacent swap Q + 1;
+        # trigrams whose list was not read to the end could not be counted
+        unread = len(grams) - complete
+        need = max(1, len(token_grams) - (Q + 1) * k - unread)
+        ok = (shared >= need) & (np.abs(self.lengths[ids] - len(token)) <= k)
+        ids, shared = ids[ok], shared[ok]
+        return ids[np.argsort(-shared, kind="stable")]
+
+    def resolve(self, raw, limit=1):
+        # -> [(canonical skill, distance)], best first; exact hits cost O(1)
+        token = canonical(raw)
+        if token in self.exact:
+            return [(token, 0)]
+        k = max_edits(token)
+        if k == 0:
+            return []
+        start = time.perf_counter()
+        deadline = start + self.budget
+        found = []
+        # candidates come most-shared-trigrams first, so when the budget cuts
+        # the scan short the likeliest matches have already been checked
+        for i in self.candidates(token, k, start + self.budget / 4):
+            d = edit_distance(token, self.names[i], k)
+            if d <= k:
+                found.append((d, self.names[i]))
+                if d == 1 and len(found) >= limit:
+                    break
+            if time.perf_counter() > deadline:
+                break
+        found.sort()
+        return [(name, d) for d, name in found[:limit]]
+
+    def correct(self, raw_skills):
+        # -> (resolved canonical skills in input order, {typed: corrected});
+        # tokens with no close match are kept as typed
+        resolved = {}
+        corrections = {}
+        for raw in raw_skills:
+            if not raw.strip():
+                continue
+            hits = self.resolve(raw)
+            if hits:
+                resolved[hits[0][0]] = None
+                if hits[0][1] > 0:
+                    corrections[raw.strip()] = hits[0][0]
+            else:
+                resolved[canonical(raw)] = None
+        return list(resolved), corrections
@@ -0,0 +1,66 @@
+# ===================== IMPORTS =====================
+import numpy as np
+from scipy import sparse
+
+from inverted_index import InvertedIndex
+from skill_vocab import canonical_text
+
+RULE_WEIGHT = 0.7
+ML_WEIGHT = 0.3
+
+
+# ===================== HYBRID KERNEL =====================
+class HybridKernel:
+    """Rule and TF-IDF columns side by side in one career matrix.
+
+    Rule columns hold ``rule_weight * 100 / len(required)`` per required skill,
+    TF-IDF columns ``ml_weight * 100 * tfidf``. A single sparse product with
+    the stacked user vector [skills | TF-IDF] gives
+    ``rule_weight * Rule_Score + ml_weight * ML_Score`` for every career.
+    """
+
+    def __init__(self, engine, tfidf, rule_weight=RULE_WEIGHT, ml_weight=ML_WEIGHT):
+        self.engine = engine
+        self.tfidf = tfidf
+        self.rule_weight = rule_weight
+        self.ml_weight = ml_weight
+        per_skill = np.divide(rule_weight * 100, engine.req_counts,
+                              out=np.zeros(engine.n_careers), where=engine.req_counts > 0)
+        self.matrix = sparse.hstack([
+            sparse.diags(per_skill) @ engine.matrix,
+            (ml_weight * 100) * tfidf.matrix,
+        ], format="csr")
+        self._index = None
+
+    @property
+    def index(self):
+        if self._index is None:
+            self._index = InvertedIndex.from_matrix(self.matrix)
+        return self._index
+
+    def query(self, user_skills):
+        # {column: weight} for the index: skill ids, then TF-IDF terms
+        query = {int(j): 1.0 for j in self.engine.user_ids(user_skills)}
+        user_vector = self.tfidf.transform([canonical_text(user_skills)])
+        for j, w in zip(user_vector.indices, user_vector.data):
+            query[self.engine.n_skills + int(j)] = w
+        return query
+
+    def query_matrix(self, profiles):
+        return sparse.hstack([
+            self.engine.user_matrix(profiles),
+            self.tfidf.transform([canonical_text(s) for s in profiles]),
+        ], format="csr")
+
+    def score(self, user_skills):
+        vec = np.zeros(self.matrix.shape[1])
+        for j, w in self.query(user_skills).items():
+            vec[j] = w
+        return self.matrix @ vec
+
+    def score_many(self, profiles):
+        # users x careers blended scores from one sparse matrix-matrix product, kept sparse
+        return (self.query_matrix(profiles) @ self.matrix.T).tocsr()
+
+    def top_k(self, user_skills, k):
+        return self.index.top_k(self.query(user_skills), k)
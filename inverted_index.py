@@ -0,0 +1,98 @@
+# ===================== IMPORTS =====================
+import numpy as np
+
+
+# ===================== INVERTED INDEX =====================
+class InvertedIndex:
+    """Term -> posting list (sorted career ids, weights) with top-k retrieval.
+
+    A career's score is ``(sum of query_weight * posting_weight) / doc_norm * scale``
+    over the query terms it contains, so careers sharing no term with the query
+    are never touched. ``doc_norm`` lets the rule-based score keep its exact
+    ``(matched / required) * 100`` arithmetic.
+    """
+
+    def __init__(self, doc_ids, weights, n_docs, doc_norms=None, scale=1.0):
+        self.doc_ids = doc_ids
+        self.weights = weights
+        self.n_docs = n_docs
+        self.doc_norms = np.ones(n_docs) if doc_norms is None else np.asarray(doc_norms, dtype=np.float64)
+        self.scale = scale
+        # best possible contribution of each term per unit of query weight
+        self.max_impact = np.array([
+            (w / self.doc_norms[d]).max() if len(d) else 0.0
+            for d, w in zip(doc_ids, weights)
+        ])
+
+    @classmethod
+    def from_matrix(cls, matrix, doc_norms=None, scale=1.0):
+        csc = matrix.tocsc()
+        csc.sort_indices()
+        doc_ids = []
+        weights = []
+        for j in range(csc.shape[1]):
+            start, end = csc.indptr[j], csc.indptr[j + 1]
+            doc_ids.append(csc.indices[start:end].astype(np.int64))
+            weights.append(csc.data[start:end].astype(np.float64))
+        return cls(doc_ids, weights, csc.shape[0], doc_norms, scale)
+
+    @property
+    def n_terms(self):
+        return len(self.doc_ids)
+
+    def top_k(self, query, k):
+        # query: {term_id: weight}. Returns (career ids, scores) ordered by
+        # score descending, ties broken by catalog order.
+        terms = [(t, q) for t, q in query.items() if q > 0 and len(self.doc_ids[t])]
+        bounds = [q * self.max_impact[t] * self.scale for t, q in terms]
+        # max-score order: high-impact, short lists first, so the long
+        # low-impact lists are only probed for surviving candidates
+        order = sorted(range(len(terms)), key=lambda i: (-bounds[i], len(self.doc_ids[terms[i][0]])))
+        rest_bound = np.cumsum([bounds[i] for i in order][::-1])[::-1].tolist() + [0.0]
+        slack = 1e-9 * max(self.scale, 1.0)
+
+        cand = np.empty(0, dtype=np.int64)
+        acc = np.empty(0, dtype=np.float64)
+        theta = -np.inf
+        accepting = True
+        for pos, i in enumerate(order):
+            term, q = terms[i]
+            docs, w = self.doc_ids[term], self.weights[term]
+            if accepting:
+                merged = np.union1d(cand, docs)
+                merged_acc = np.zeros(len(merged))
+                merged_acc[np.searchsorted(merged, cand)] = acc
+                merged_acc[np.searchsorted(merged, docs)] += q * w
+                cand, acc = merged, merged_acc
+            else:
+                # no unseen career can reach the top-k any more: probe only
+                at = np.searchsorted(docs, cand)
+                at[at == len(docs)] = 0
+                hit = docs[at] == cand
+                acc[hit] += q * w[at[hit]]
+
+            remaining = rest_bound[pos + 1]
+            partial = acc / self.doc_norms[cand] * self.scale
+            if len(cand) >= k > 0:
+                theta = np.partition(partial, len(partial) - k)[len(partial) - k]
+            if accepting and remaining + slack < theta:
+                accepting = False
+            keep = partial + remaining + slack >= theta
+            cand, acc = cand[keep], acc[keep]
+
+        scores = acc / self.doc_norms[cand] * self.scale
+        best = np.lexsort((cand, -scores))[:k]
+        ids, scores = cand[best], scores[best]
+
+        if len(ids) < k:
+            # not enough overlapping careers: pad with zero scores in catalog order
+            seen = set(ids.tolist())
+            pad = []
+            for d in range(self.n_docs):
+                if len(ids) + len(pad) >= k:
+                    break
+                if d not in seen:
+                    pad.append(d)
+            ids = np.concatenate([ids, np.asarray(pad, dtype=np.int64)])
+            scores = np.concatenate([scores, np.zeros(len(pad))])
+        return ids, scores
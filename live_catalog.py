@@ -0,0 +1,399 @@
+# ===================== IMPORTS =====================
+import logging
+import math
+import os
+import threading
+from collections import Counter, defaultdict
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from catalog import badge, load_catalog
+from hybrid_kernel import ML_WEIGHT, RULE_WEIGHT
+from skill_vocab import canonical, canonical_set, canonical_skills, canonical_text
+
+# Hot-reloadable catalog index. Every edit of the CSV is diffed row by row
+# and applied as a delta to an immutable snapshot: only the posting lists
+# of the skills / words in changed rows are rewritten, and the new snapshot
+# replaces the old one with a single reference swap, so readers never block.
+#
+# TF-IDF stays exact without refitting. sklearn's smoothed idf is
+#   idf_t = ln((1 + N) / (1 + df_t)) + 1 = a_t + L,
+#   a_t = 1 - ln(1 + df_t),  L = ln(1 + N)
+# so each career keeps S0 = sum tf^2, S1 = sum tf^2 a, S2 = sum tf^2 a^2 and
+# its L2 norm for any N is sqrt(S2 + 2 L S1 + L^2 S0). A df change only
+# touches the careers in that word's posting list; N only moves L.
+#
+# A new snapshot shares everything it does not change with the previous one:
+# per-career and per-term lists are split into pages of PAGE entries and a
+# page is copied only when written. The skill and word id tables only ever
+# grow, so all snapshots share them; a snapshot ignores ids past its own
+# lists. The key table belongs to the writer (apply() is only ever called
+# on the newest snapshot).
+
+FIELDS = ["Career", "Required_Skills", "Image", "Description", "Learn_Link", "Salary"]
+MODES = ("rule", "hybrid")
+PAGE = 1024
+_analyzer = TfidfVectorizer().build_analyzer()
+_EMPTY = np.empty(0, dtype=np.int64)
+log = logging.getLogger(__name__)
+
+
+def read_rows(path):
+    # key -> field tuple; repeated career names get "#2", "#3", ... suffixes
+    df = load_catalog(path)
+    rows = {}
+    seen = Counter()
+    for values in df[FIELDS].fillna("").astype(str).itertuples(index=False):
+        seen[values[0]] += 1
+        key = values[0] if seen[values[0]] == 1 else f"{values[0]}#{seen[values[0]]}"
+        rows[key] = tuple(values)
+    return rows
+
+
+def diff_rows(old_keys, old_row, new_rows):
+    delta = {"add": {}, "edit": {}, "delete": []}
+    for key, row in new_rows.items():
+        if key not in old_keys:
+            delta["add"][key] = row
+        elif old_row(key) != row:
+            delta["edit"][key] = row
+    delta["delete"] = [key for key in old_keys if key not in new_rows]
+    return delta
+
+
+# ===================== PAGED LIST =====================
+class _Pages:
+    """List kept in pages of PAGE entries; a copy shares pages until it writes one."""
+
+    def __init__(self, pages=None, size=0):
+        self.pages = [] if pages is None else pages
+        self.size = size
+        self.owned = set()
+
+    def copy(self):
+        return _Pages(list(self.pages), self.size)
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        for page in self.pages:
+            yield from page
+
+    def __getitem__(self, i):
+        return self.pages[i // PAGE][i % PAGE]
+
+    def __setitem__(self, i, value):
+        self._own(i // PAGE)[i % PAGE] = value
+
+    def _own(self, p):
+        if p not in self.owned:
+            self.pages[p] = list(self.pages[p])
+            self.owned.add(p)
+        return self.pages[p]
+
+    def append(self, value):
+        if self.size % PAGE == 0:
+            self.pages.append([])
+            self.owned.add(len(self.pages) - 1)
+        self._own(len(self.pages) - 1).append(value)
+        self.size += 1
+
+    def extend(self, values):
+        for value in values:
+            self.append(value)
+
+
+# ===================== SNAPSHOT =====================
+class LiveSnapshot:
+    modes = MODES
+
+    def __init__(self):
+        self.version = 0
+        self.rows = _Pages()
+        self.keys = {}
+        self.n_live = 0
+        # rule side: interned skills, posting lists, required counts
+        self.skill_ids = {}
+        self.skill_postings = _Pages()
+        self.req_len = np.zeros(0)
+        self.doc_skills = _Pages()
+        # TF-IDF side: vocabulary, (doc, tf) posting lists, df and norm sums
+        self.vocab = {}
+        self.word_postings = _Pages()
+        self.word_tf = _Pages()
+        self.df = np.zeros(0, dtype=np.int64)
+        self.doc_words = _Pages()
+        self.s0 = np.zeros(0)
+        self.s1 = np.zeros(0)
+        self.s2 = np.zeros(0)
+
+    @classmethod
+    def build(cls, rows):
+        return cls().apply({"add": rows, "edit": {}, "delete": []})
+
+    def row(self, key):
+        return self.rows[self.keys[key]]
+
+    def _copy(self):
+        snap = LiveSnapshot.__new__(LiveSnapshot)
+        snap.__dict__.update(self.__dict__)
+        for name in ("rows", "skill_postings", "doc_skills", "word_postings", "word_tf", "doc_words"):
+            setattr(snap, name, getattr(self, name).copy())
+        for name in ("req_len", "df", "s0", "s1", "s2"):
+            setattr(snap, name, getattr(self, name).copy())
+        return snap
+
+    # ---------- delta ----------
+    def apply(self, delta):
+        snap = self._copy()
+        snap.version = self.version + 1
+        n_new = len(delta["add"])
+        if n_new:
+            grow = np.zeros(n_new)
+            snap.req_len = np.concatenate([snap.req_len, grow])
+            snap.s0 = np.concatenate([snap.s0, grow])
+            snap.s1 = np.concatenate([snap.s1, grow])
+            snap.s2 = np.concatenate([snap.s2, grow])
+
+        skill_out, skill_in = defaultdict(list), defaultdict(list)
+        word_out, word_in = defaultdict(list), defaultdict(list)
+        df_delta = Counter()
+        changed = []
+
+        def unlink(d):
+            for s in snap.doc_skills[d]:
+                skill_out[s].append(d)
+            for w, tf in snap.doc_words[d]:
+                word_out[w].append(d)
+                df_delta[w] -= 1
+
+        def link(d, row):
+            skills = [snap.skill_ids.setdefault(s, len(snap.skill_ids)) for s in canonical_skills(row[1])]
+            counts = Counter(_analyzer(canonical_text(row[1])))
+            words = []
+            for token, tf in counts.items():
+                w = snap.vocab.setdefault(token, len(snap.vocab))
+                words.append((w, tf))
+                word_in[w].append((d, tf))
+                df_delta[w] += 1
+            for s in skills:
+                skill_in[s].append(d)
+            snap.rows[d] = row
+            snap.doc_skills[d] = skills
+            snap.doc_words[d] = words
+            snap.req_len[d] = len(skills)
+            changed.append(d)
+
+        for key in delta["delete"]:
+            d = snap.keys.pop(key)
+            unlink(d)
+            snap.rows[d] = None
+            snap.doc_skills[d] = []
+            snap.doc_words[d] = []
+            snap.req_len[d] = snap.s0[d] = snap.s1[d] = snap.s2[d] = 0
+            snap.n_live -= 1
+        for key, row in delta["edit"].items():
+            d = snap.keys[key]
+            unlink(d)
+            link(d, row)
+        for key, row in delta["add"].items():
+            d = len(snap.rows)
+            snap.keys[key] = d
+            snap.rows.append(None)
+            snap.doc_skills.append([])
+            snap.doc_words.append([])
+            link(d, row)
+            snap.n_live += 1
+
+        snap.skill_postings.extend([_EMPTY] * (len(snap.skill_ids) - len(snap.skill_postings)))
+        snap.word_postings.extend([_EMPTY] * (len(snap.vocab) - len(snap.word_postings)))
+        snap.word_tf.extend([np.zeros(0)] * (len(snap.vocab) - len(snap.word_tf)))
+        snap.df = np.concatenate([snap.df, np.zeros(len(snap.vocab) - len(snap.df), dtype=np.int64)])
+        old_df = {w: snap.df[w] for w in df_delta}
+        for w, change in df_delta.items():
+            snap.df[w] += change
+
+        # ---------- posting lists of touched terms only ----------
+        for s in set(skill_out) | set(skill_in):
+            docs = snap.skill_postings[s]
+            if s in skill_out:
+                docs = docs[~np.isin(docs, skill_out[s])]
+            if s in skill_in:
+                # posting lists stay sorted; a delta only inserts a few ids
+                add = np.unique(np.asarray(skill_in[s], dtype=np.int64))
+                add = add[~np.isin(add, docs)]
+                docs = np.insert(docs, np.searchsorted(docs, add), add)
+            snap.skill_postings[s] = docs
+
+        for w in set(word_out) | set(word_in):
+            docs, tfs = snap.word_postings[w], snap.word_tf[w]
+            if w in word_out:
+                keep = ~np.isin(docs, word_out[w])
+                docs, tfs = docs[keep], tfs[keep]
+            if w in word_in:
+                add = np.asarray(word_in[w], dtype=np.float64).reshape(-1, 2)
+                docs = np.concatenate([docs, add[:, 0].astype(np.int64)])
+                tfs = np.concatenate([tfs, add[:, 1]])
+                order = np.argsort(docs, kind="stable")
+                docs, tfs = docs[order], tfs[order]
+            snap.word_postings[w], snap.word_tf[w] = docs, tfs
+
+        # ---------- incremental norm sums ----------
+        is_changed = np.zeros(len(snap.rows), dtype=bool)
+        is_changed[changed] = True
+        for w, before in old_df.items():
+            if before == snap.df[w]:
+                continue
+            a_old = 1 - math.log(1 + before)
+            a_new = 1 - math.log(1 + snap.df[w])
+            docs, tfs = snap.word_postings[w], snap.word_tf[w]
+            stay = ~is_changed[docs]
+            tf2 = tfs[stay] ** 2
+            snap.s1[docs[stay]] += tf2 * (a_new - a_old)
+            snap.s2[docs[stay]] += tf2 * (a_new ** 2 - a_old ** 2)
+        for d in set(changed):
+            s0 = s1 = s2 = 0.0
+            for w, tf in snap.doc_words[d]:
+                a = 1 - math.log(1 + snap.df[w])
+                s0 += tf * tf
+                s1 += tf * tf * a
+                s2 += tf * tf * a * a
+            snap.s0[d], snap.s1[d], snap.s2[d] = s0, s1, s2
+        return snap
+
+    # ---------- scoring ----------
+    def _rule(self, user_skills):
+        n_skills = len(self.skill_postings)
+        ids = {j for j in (self.skill_ids.get(canonical(s), n_skills) for s in user_skills) if j < n_skills}
+        lists = [self.skill_postings[s] for s in ids]
+        if not lists:
+            return _EMPTY, np.zeros(0)
+        docs, counts = np.unique(np.concatenate(lists), return_counts=True)
+        return docs, (counts / self.req_len[docs]) * 100
+
+    def _ml(self, user_text):
+        n_words = len(self.df)
+        counts = Counter(t for t in _analyzer(user_text) if self.vocab.get(t, n_words) < n_words)
+        terms = [(self.vocab[t], tf) for t, tf in counts.items() if self.df[self.vocab[t]] > 0]
+        if not terms:
+            return _EMPTY, np.zeros(0)
+        L = math.log(1 + self.n_live)
+        idf = {w: 1 - math.log(1 + self.df[w]) + L for w, _ in terms}
+        u = {w: tf * idf[w] for w, tf in terms}
+        u_norm = math.sqrt(sum(v * v for v in u.values()))
+        docs = np.concatenate([self.word_postings[w] for w in u])
+        contrib = np.concatenate([self.word_tf[w] * (u[w] / u_norm) * idf[w] for w in u])
+        cand, inverse = np.unique(docs, return_inverse=True)
+        dot = np.bincount(inverse, weights=contrib, minlength=len(cand))
+        norm = np.sqrt(self.s2[cand] + 2 * L * self.s1[cand] + L * L * self.s0[cand])
+        return cand, dot / norm
+
+    def score(self, user_skills, mode="hybrid"):
+        # sparse (career ids, scores) for careers overlapping the query
+        if mode not in MODES:
+            raise ValueError(f"unknown mode {mode!r}, a live catalog serves {MODES}")
+        rule_docs, rule = self._rule(user_skills)
+        if mode == "rule":
+            return rule_docs, rule
+        ml_docs, ml = self._ml(canonical_text(user_skills))
+        docs = np.union1d(rule_docs, ml_docs)
+        scores = np.zeros(len(docs))
+        scores[np.searchsorted(docs, rule_docs)] += RULE_WEIGHT * rule
+        scores[np.searchsorted(docs, ml_docs)] += ML_WEIGHT * (ml * 100)
+        return docs, scores
+
+    def top_k(self, user_skills, k, mode="hybrid"):
+        docs, scores = self.score(user_skills, mode)
+        best = np.lexsort((docs, -scores))[:k]
+        ids, scores = docs[best].tolist(), scores[best].tolist()
+        if len(ids) < k:
+            seen = set(ids)
+            for d, row in enumerate(self.rows):
+                if len(ids) >= k:
+                    break
+                if row is not None and d not in seen:
+                    ids.append(d)
+                    scores.append(0.0)
+        return ids, scores
+
+    def recommend(self, user_skills, k=3, mode="hybrid"):
+        user = canonical_set(user_skills)
+        results = []
+        for d, score in zip(*self.top_k(user_skills, k, mode)):
+            career, req, _, _, learn_link, salary = self.rows[d]
+            results.append({
+                "career": career,
+                "match_score": round(float(score), 4),
+                "badge": badge(score),
+                "missing_skills": sorted(canonical_skills(req) - user),
+                "salary": salary,
+                "learn_link": learn_link,
+            })
+        return results
+
+
+# ===================== WATCHER =====================
+class CatalogWatcher:
+    """Polls the catalog CSV and swaps in incrementally updated snapshots."""
+
+    def __init__(self, path, interval=2.0):
+        self.path = path
+        self.interval = interval
+        self._stamp = self._file_stamp()
+        self.snapshot = LiveSnapshot.build(read_rows(path))
+        self.reloads = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _file_stamp(self):
+        st = os.stat(self.path)
+        return st.st_size, st.st_mtime_ns
+
+    def poll(self):
+        # -> the delta that was applied, or None when the content did not change
+        stamp = self._file_stamp()
+        if stamp == self._stamp:
+            return None
+        new_rows = read_rows(self.path)
+        self._stamp = stamp
+        snap = self.snapshot
+        delta = diff_rows(snap.keys, snap.row, new_rows)
+        if not (delta["add"] or delta["edit"] or delta["delete"]):
+            return None  # touched or re-saved without edits
+        self.snapshot = snap.apply(delta)  # atomic reference swap
+        self.reloads += 1
+        return delta
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                delta = self.poll()
+            except (OSError, ValueError, KeyError):
+                log.exception("catalog reload of %s failed", self.path)
+                continue
+            if delta is not None:
+                log.info("catalog reloaded: +%d ~%d -%d (v%d)", len(delta["add"]), len(delta["edit"]),
+                         len(delta["delete"]), self.snapshot.version)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="catalog-watcher", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    # same interface as Recommender, so the HTTP service can serve from it
+    modes = MODES
+
+    @property
+    def n_careers(self):
+        return self.snapshot.n_live
+
+    def recommend_many(self, profiles, k=3, mode="hybrid"):
+        snap = self.snapshot  # one consistent version for the whole batch
+        return [snap.recommend(skills, k, mode) for skills in profiles]
@@ -0,0 +1,166 @@
+# ===================== IMPORTS =====================
+import argparse
+import time
+
+import numpy as np
+
+# Approximate top-k for very large catalogs: MinHash signatures + LSH banding.
+#
+# Every career gets a MinHash signature of BANDS x ROWS values; two skill sets
+# agree on one value with probability equal to their Jaccard similarity, so a
+# career lands in the same bucket as the user in at least one band with
+# probability 1 - (1 - J^ROWS)^BANDS. Only those careers are rescored with
+# the exact rule score, which keeps the results exact for every career that
+# is found. More bands or fewer rows find more careers (higher recall, more
+# rescoring). max_candidates caps the rescoring work per query, keeping the
+# careers that collide with the user in the most bands (a Jaccard estimate).
+# Measure the trade-offs with
+#
+#   python lsh_index.py --careers 1000000 --configs 32x2,32x3 --max-candidates 2000 -k 10
+
+BANDS = 32
+ROWS = 2
+MAX_CANDIDATES = 2000
+PRIME = (1 << 31) - 1  # hashes are (a * skill + b) mod PRIME
+CHUNK = 65_536  # careers hashed per step while building
+
+
+# ===================== MINHASH LSH =====================
+class MinHashLSH:
+    """LSH buckets over the careers of a SkillScoringEngine, exact rescoring."""
+
+    def __init__(self, engine, bands=BANDS, rows=ROWS, max_candidates=MAX_CANDIDATES, seed=0):
+        self.engine = engine
+        self.bands = bands
+        self.rows = rows
+        self.max_candidates = max_candidates
+        rng = np.random.default_rng(seed)
+        n_perm = bands * rows
+        a = rng.integers(1, PRIME, size=(n_perm, 1), dtype=np.uint64)
+        b = rng.integers(0, PRIME, size=(n_perm, 1), dtype=np.uint64)
+        skills = np.arange(engine.n_skills, dtype=np.uint64)[None, :]
+        self.hashes = ((a * skills + b) % PRIME).astype(np.uint32)  # perm x skill
+        # random odd multipliers fold the ROWS values of a band into one key
+        self.mix = rng.integers(1, 1 << 63, size=rows, dtype=np.uint64) | np.uint64(1)
+
+        matrix = engine.matrix
+        nonempty = np.flatnonzero(np.diff(matrix.indptr) > 0)
+        keys = np.empty((bands, len(nonempty)), dtype=np.uint64)
+        for start in range(0, len(nonempty), CHUNK):
+            batch = nonempty[start:start + CHUNK]
+            begin, end = matrix.indptr[batch], matrix.indptr[batch + 1]
+            # the rows are not contiguous when empty careers are skipped
+            cols = np.concatenate([matrix.indices[s:e] for s, e in zip(begin, end)])
+            offsets = np.concatenate([[0], np.cumsum(end - begin)[:-1]])
+            sig = np.minimum.reduceat(self.hashes[:, cols], offsets, axis=1)
+            keys[:, start:start + len(batch)] = self._band_keys(sig)
+        order = np.argsort(keys, axis=1, kind="stable")
+        self.keys = np.take_along_axis(keys, order, axis=1)
+        self.ids = nonempty[order].astype(np.int32)
+
+    def _band_keys(self, sig):
+        # sig: perm x careers -> bands x careers
+        sig = sig.astype(np.uint64).reshape(self.bands, self.rows, -1)
+        return (sig * self.mix[None, :, None]).sum(axis=1, dtype=np.uint64)
+
+    @property
+    def nbytes(self):
+        return self.keys.nbytes + self.ids.nbytes + self.hashes.nbytes
+
+    def candidates(self, user_skills):
+        ids = self.engine.user_ids(user_skills)
+        if not len(ids):
+            return np.empty(0, dtype=np.int64)
+        keys = self._band_keys(self.hashes[:, ids].min(axis=1)[:, None])[:, 0]
+        found = []
+        for band, key in enumerate(keys):
+            lo = np.searchsorted(self.keys[band], key, "left")
+            hi = np.searchsorted(self.keys[band], key, "right")
+            found.append(self.ids[band, lo:hi])
+        cand, hits = np.unique(np.concatenate(found), return_counts=True)
+        if self.max_candidates and len(cand) > self.max_candidates:
+            cand = np.sort(cand[np.argpartition(-hits, self.max_candidates - 1)[:self.max_candidates]])
+        return cand.astype(np.int64)
+
+    def rescore(self, user_skills, cand):
+        matched = self.engine.matrix[cand] @ self.engine.user_vector(user_skills)
+        return matched / self.engine.req_counts[cand] * 100
+
+    def top_k(self, user_skills, k):
+        # same (ids, scores) as engine.top_k(); with fewer than k candidates
+        # the exact index answers instead, so short queries never come back short
+        cand = self.candidates(user_skills)
+        if len(cand) < k:
+            return self.engine.top_k(user_skills, k)
+        scores = self.rescore(user_skills, cand)
+        best = np.lexsort((cand, -scores))[:k]
+        return cand[best], scores[best]
+
+
+# ===================== RECALL =====================
+def recall_at_k(lsh, queries, k=10):
+    # share of the exact top-k that the approximate top-k reproduces; a
+    # career tied with the exact k-th score counts, so tie order is ignored
+    hits = 0
+    for q in queries:
+        _, exact = lsh.engine.top_k(q, k)
+        _, approx = lsh.top_k(q, k)
+        hits += min(k, int((approx >= exact[-1] - 1e-9).sum())) if len(exact) else k
+    return hits / (k * len(queries))
+
+
+def evaluate(lsh, queries, k=10):
+    approx_ms, exact_ms, n_cand = [], [], []
+    for q in queries:
+        start = time.perf_counter()
+        lsh.top_k(q, k)
+        approx_ms.append((time.perf_counter() - start) * 1000)
+        start = time.perf_counter()
+        lsh.engine.top_k(q, k)
+        exact_ms.append((time.perf_counter() - start) * 1000)
+        n_cand.append(len(lsh.candidates(q)))
+    return {
+        "bands": lsh.bands,
+        "rows": lsh.rows,
+        "max_candidates": lsh.max_candidates,
+        f"recall@{k}": round(recall_at_k(lsh, queries, k), 4),
+        "candidates_mean": round(float(np.mean(n_cand)), 1),
+        "approx_p50_ms": round(float(np.percentile(approx_ms, 50)), 4),
+        "approx_p99_ms": round(float(np.percentile(approx_ms, 99)), 4),
+        "exact_p50_ms": round(float(np.percentile(exact_ms, 50)), 4),
+        "index_mb": round(lsh.nbytes / 2**20, 1),
+    }
+
+
+# ===================== CLI =====================
+def main(argv=None):
+    from catalog import CATALOG_PATH, load_catalog
+    from scoring_engine import SkillScoringEngine
+    from synthetic_catalog import SkillModel
+
+    parser = argparse.ArgumentParser(description="Measure recall@k and latency of the MinHash LSH index.")
+    parser.add_argument("--careers", type=int, help="synthetic catalog size (default: the real catalog)")
+    parser.add_argument("--catalog", default=CATALOG_PATH)
+    parser.add_argument("--configs", default=f"{BANDS}x{ROWS}", help="comma separated BANDSxROWS")
+    parser.add_argument("--max-candidates", type=int, default=MAX_CANDIDATES,
+                        help="cap on careers rescored per query, 0 for no cap")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("-k", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    model = SkillModel.from_csv(args.catalog)
+    df = model.catalog(args.careers) if args.careers else load_catalog(args.catalog)
+    engine = SkillScoringEngine.from_skills(df["Required_Skills"])
+    del df
+    queries = model.profiles(args.queries, seed=1)
+    for config in args.configs.split(","):
+        bands, rows = (int(x) for x in config.split("x"))
+        start = time.perf_counter()
+        lsh = MinHashLSH(engine, bands, rows, args.max_candidates)
+        result = {"careers": engine.n_careers, "build_s": round(time.perf_counter() - start, 3)}
+        result.update(evaluate(lsh, queries, args.k))
+        print(" ".join(f"{key}={value}" for key, value in result.items()))
+
+
+if __name__ == "__main__":
+    main()
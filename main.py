@@ -2,13 +2,23 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-from fpdf import FPDF
+from tfidf_model import load_or_fit
+from fuzzy_skills import FuzzySkillResolver
+from autocomplete import SkillAutocomplete
+from scoring_engine import SkillScoringEngine
+from report import generate_pdf
+from report_cache import ReportCache, catalog_version, report_key
+from disk_cache import DiskCache
+from charts import cached_figure, chart_key, downsample
+from progressive import reserve
+from metrics import Run, debug_panel, debug_requested, observe
+from skill_vocab import canonical_set, canonical_skills, canonical_text
 from io import BytesIO
 import time
 
 # ===================== DATA =====================
+debug = debug_requested()
+run = Run("main", trace_memory=debug)
 data = {
     "Career": [
         "Data Scientist","Web Developer","AI Engineer","UI/UX Designer",
@@ -65,17 +75,27 @@ data = {
 }
 
 df = pd.DataFrame(data)
+catalog_id = catalog_version(df)
+run.lap("load")
 
 # ===================== FUNCTIONS =====================
+@st.cache_resource
+def load_tfidf(skills_list):
+    return load_or_fit([canonical_text(s) for s in skills_list])
+
+@st.cache_resource
+def load_resolver(skills_list):
+    return FuzzySkillResolver(set().union(*(canonical_skills(s) for s in skills_list)))
+
+@st.cache_resource
+def load_autocomplete(skills_list):
+    return SkillAutocomplete.from_engine(SkillScoringEngine.from_skills(skills_list))
+
 def calculate_similarity(user_input, skills_list):
-    vectorizer = TfidfVectorizer()
-    skill_matrix = vectorizer.fit_transform(skills_list)
-    user_vector = vectorizer.transform([user_input])
-    return cosine_similarity(user_vector, skill_matrix).flatten()
+    return load_tfidf(tuple(skills_list)).similarity(canonical_text(user_input))
 
 def get_missing_skills(user_skills, required_skills_str):
-    req_set = set(s.strip().lower() for s in required_skills_str.split(","))
-    return req_set - user_skills
+    return canonical_skills(required_skills_str) - canonical_set(user_skills)
 
 def assign_badge(score):
     if score >= 85: return "🏆 Excellent Fit"
@@ -83,44 +103,40 @@ def assign_badge(score):
     else: return "⚠️ Needs Improvement"
 
 def plot_radar_chart(top_career, user_skills):
-    required_skills = set(skill.strip() for skill in top_career["Required_Skills"].split(","))
-    all_skills = list(required_skills.union(user_skills))
-    
-    # Create vectors for radar
-    user_vec = [1 if s.lower() in user_skills else 0 for s in all_skills]
-    req_vec = [1 if s in required_skills else 0 for s in all_skills]
+    required_skills = canonical_skills(top_career["Required_Skills"])
+    user_skills = canonical_set(user_skills)
     
-    radar_df = pd.DataFrame({
-        'Skill': all_skills * 2,
-        'Value': user_vec + req_vec,
-        'Source': ['You']*len(all_skills) + ['Required']*len(all_skills)
-    })
+    def build():
+        all_skills = list(required_skills.union(user_skills))
+        
+        # Create vectors for radar
+        user_vec = [1 if s in user_skills else 0 for s in all_skills]
+        req_vec = [1 if s in required_skills else 0 for s in all_skills]
+        
+        radar_df = pd.DataFrame({
+            'Skill': all_skills * 2,
+            'Value': user_vec + req_vec,
+            'Source': ['You']*len(all_skills) + ['Required']*len(all_skills)
+        })
+        
+        fig = px.line_polar(radar_df, r='Value', theta='Skill', color='Source', 
+                            line_close=True, title=f"Skill Gap Analysis: {top_career['Career']}")
+        return fig.update_traces(fill='toself')
     
-    fig = px.line_polar(radar_df, r='Value', theta='Skill', color='Source', 
-                        line_close=True, title=f"Skill Gap Analysis: {top_career['Career']}")
-    fig.update_traces(fill='toself')
-    st.plotly_chart(fig, use_container_width=True)
-
-def generate_pdf(recs_df, user_skills):
-    pdf = FPDF()
-    pdf.add_page()
-    pdf.set_font("Arial", "B", 16)
-    pdf.cell(0, 10, "Career Recommendation Report", ln=True, align="C")
-    pdf.set_font("Arial", "", 12)
-    pdf.ln(5)
-    pdf.cell(0, 10, f"Your Skills: {', '.join(user_skills)}", ln=True)
-    pdf.ln(10)
-    
-    for _, row in recs_df.head(5).iterrows():
-        pdf.set_font("Arial", "B", 14)
-        pdf.cell(0, 10, f"{row['Career']} ({row['Match_Score']:.1f}%)", ln=True)
-        pdf.set_font("Arial", "", 12)
-        pdf.multi_cell(0, 7, f"Description: {row['Description']}")
-        missing = get_missing_skills(user_skills, row['Required_Skills'])
-        pdf.multi_cell(0, 7, f"Skills to Learn: {', '.join(missing) if missing else 'None! You are ready.'}")
-        pdf.ln(5)
-    
-    return pdf.output(dest='S').encode('latin-1')
+    key = ("main.radar", top_career['Career'], canonical_text(required_skills), canonical_text(user_skills))
+    st.plotly_chart(cached_figure(key, build), use_container_width=True)
+
+@st.cache_resource
+def load_report_cache():
+    # memory first, then the SQLite tier shared with the other app processes
+    return ReportCache(backing=DiskCache())
+
+def render_report(rows, user_skills, missing_skills):
+    # runs when the download is requested, outside the script run
+    start = time.perf_counter()
+    pdf = generate_pdf(rows, user_skills, missing_skills)
+    observe("main", "pdf", time.perf_counter() - start)
+    return pdf
 
 # ===================== PAGE CONFIG =====================
 st.set_page_config(page_title="Career Guide AI", layout="wide", page_icon="🎯")
@@ -131,18 +147,31 @@ with st.sidebar:
     st.header("🔍 Quick Skill Search")
     search = st.text_input("Find careers by specific skill:")
     if search:
-        matches = df[df["Required_Skills"].str.lower().str.contains(search.lower())]
-        for _, r in matches.iterrows():
-            st.info(f"**{r['Career']}**")
+        run.skip()
+        skill_index = load_autocomplete(tuple(df["Required_Skills"]))
+        skill_ids, matches = skill_index.search(search)
+        if skill_ids:
+            st.caption("Skills: " + ", ".join(skill_index.display[j] for j in skill_ids))
+        for i, j in matches:
+            st.info(f"**{df['Career'].iloc[i]}** · {skill_index.display[j]}")
+        run.lap("search")
 
 # User Interaction
 user_input = st.text_area("🧠 Type your skills (e.g., Python, SQL, Figma):", "Python, SQL, HTML")
-user_skills_processed = set(s.strip().lower() for s in user_input.split(","))
+run.skip()
+user_skills_processed, corrections = load_resolver(tuple(df["Required_Skills"])).correct(user_input.split(","))
+run.lap("normalize")
+if corrections:
+    st.caption("🔤 Did you mean: " + ", ".join(f"{typed} → {fixed}" for typed, fixed in corrections.items()))
 
 if st.button("🚀 Analyze My Career Path"):
     # 1. Similarity Calculation
-    df["Match_Score"] = calculate_similarity(user_input, df["Required_Skills"]) * 100
+    df["Match_Score"] = calculate_similarity(user_skills_processed, df["Required_Skills"]) * 100
+    run.lap("score")
     recommendations = df.sort_values(by="Match_Score", ascending=False).reset_index(drop=True)
+    top5 = recommendations.head(5)
+    missing_top = [get_missing_skills(user_skills_processed, req) for req in top5["Required_Skills"]]
+    run.lap("rank")
     
     # 2. Results Header
     st.success(f"Top Recommendation: **{recommendations.iloc[0]['Career']}**")
@@ -158,7 +187,7 @@ if st.button("🚀 Analyze My Career Path"):
             st.write(assign_badge(row['Match_Score']))
             st.metric("Match Score", f"{row['Match_Score']:.1f}%")
             
-            missing = get_missing_skills(user_skills_processed, row['Required_Skills'])
+            missing = missing_top[i]
             if missing:
                 st.warning(f"Learn: {', '.join(list(missing)[:3])}...")
             else:
@@ -166,44 +195,66 @@ if st.button("🚀 Analyze My Career Path"):
 
     st.divider()
 
+    # the cards above are already on screen; the rest fills these slots in order
+    analytics_slot, compare_slot, report_slot = reserve("charts", "comparison tool", "report")
+
+    run.lap("cards")
+
     # 4. Analytics Section
-    col_left, col_right = st.columns(2)
-    with col_left:
-        st.subheader("📊 Career Match Overview")
-        fig_bar = px.bar(recommendations, x="Match_Score", y="Career", 
-                         orientation='h', color="Match_Score", template="plotly_dark")
-        fig_bar.update_layout(yaxis={'categoryorder':'total ascending'})
-        st.plotly_chart(fig_bar, use_container_width=True)
+    with analytics_slot.container():
+        col_left, col_right = st.columns(2)
+        with col_left:
+            st.subheader("📊 Career Match Overview")
+            overview = downsample(recommendations, "Career", "Match_Score")
+            fig_bar = cached_figure(chart_key("main.bar", user_skills_processed, catalog_id), lambda: px.bar(
+                overview, x="Match_Score", y="Career", 
+                orientation='h', color="Match_Score", template="plotly_dark"
+            ).update_layout(yaxis={'categoryorder':'total ascending'}))
+            st.plotly_chart(fig_bar, use_container_width=True)
     
-    with col_right:
-        st.subheader("🎯 Deep Dive: Top Career")
-        plot_radar_chart(recommendations.iloc[0], user_skills_processed)
+        with col_right:
+            st.subheader("🎯 Deep Dive: Top Career")
+            plot_radar_chart(recommendations.iloc[0], user_skills_processed)
+
+    run.lap("charts")
 
     # 5. Career Comparison Tool
-    st.divider()
-    st.subheader("⚔️ Compare Careers")
-    c_list = recommendations["Career"].tolist()
-    choice1 = st.selectbox("Career 1", c_list, index=0)
-    choice2 = st.selectbox("Career 2", c_list, index=1)
+    with compare_slot.container():
+        st.divider()
+        st.subheader("⚔️ Compare Careers")
+        c_list = recommendations["Career"].tolist()
+        choice1 = st.selectbox("Career 1", c_list, index=0)
+        choice2 = st.selectbox("Career 2", c_list, index=1)
     
-    comp_col1, comp_col2 = st.columns(2)
-    r1 = df[df["Career"] == choice1].iloc[0]
-    r2 = df[df["Career"] == choice2].iloc[0]
+        comp_col1, comp_col2 = st.columns(2)
+        r1 = df[df["Career"] == choice1].iloc[0]
+        r2 = df[df["Career"] == choice2].iloc[0]
     
-    with comp_col1:
-        st.info(f"**{choice1}**\n\nSkills: {r1['Required_Skills']}")
-    with comp_col2:
-        st.info(f"**{choice2}**\n\nSkills: {r2['Required_Skills']}")
+        with comp_col1:
+            st.info(f"**{choice1}**\n\nSkills: {r1['Required_Skills']}")
+        with comp_col2:
+            st.info(f"**{choice2}**\n\nSkills: {r2['Required_Skills']}")
+
+    run.lap("compare")
 
     # 6. PDF Export
-    st.divider()
-    st.subheader("📄 Get Your Report")
-    pdf_bytes = generate_pdf(recommendations, user_skills_processed)
-    st.download_button(label="📥 Download Career Roadmap (PDF)", 
-                       data=pdf_bytes, 
-                       file_name="My_Career_Roadmap.pdf", 
-                       mime="application/pdf")
+    with report_slot.container():
+        st.divider()
+        st.subheader("📄 Get Your Report")
+        # rendered only when the button is pressed, and at most once per
+        # (skill set, catalog version)
+        reports = load_report_cache()
+        report_id = report_key(user_skills_processed, catalog_id)
+        st.download_button(label="📥 Download Career Roadmap (PDF)", 
+                           data=lambda: reports.get_or_render(
+                               report_id, lambda: render_report(top5.to_dict("records"), user_skills_processed, missing_top)), 
+                           file_name="My_Career_Roadmap.pdf", 
+                           mime="application/pdf")
+    run.lap("report")
 
 # Footer
+run.finish()
 st.markdown("---")
-st.caption("Built with ❤️ | Career Recommendation Engine v2.0")
\ No newline at end of file
+st.caption("Built with ❤️ | Career Recommendation Engine v2.0")
+if debug:
+    debug_panel(run)
\ No newline at end of file
@@ -0,0 +1,225 @@
+# ===================== IMPORTS =====================
+import os
+import atexit
+import threading
+import time
+import tracemalloc
+import weakref
+
+# Per-stage latency histograms and peak memory for the app pipelines
+# (load -> normalize -> score -> rank -> cards -> charts -> report).
+# The apps are linear scripts, so a Run is a lap timer: run.lap("score")
+# records the time since the previous lap as the "score" stage.
+#
+# Aggregates are process-wide (all sessions) and are written to a
+# Prometheus text file, e.g. for node_exporter's textfile collector, at most
+# every WRITE_INTERVAL seconds and once more at exit. Peak memory needs
+# tracemalloc, which slows allocation down, so it is only on with
+# CAREER_TRACEMALLOC=1 or while a debug run (?debug=1) is in progress; it is
+# stopped when the last one finishes. tracemalloc is process-wide, so
+# concurrent sessions share peaks.
+
+PROM_PATH = os.environ.get("CAREER_METRICS_FILE", os.path.join("artifacts", "metrics.prom"))
+WRITE_INTERVAL = float(os.environ.get("CAREER_METRICS_INTERVAL", "15"))
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_lock = threading.Lock()
+_stages = {}
+_tracing = 0  # debug runs that still need tracemalloc
+_written = {}  # path -> (perf_counter of the last write, samples it held)
+
+
+# ===================== HISTOGRAM =====================
+class StageStats:
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKETS) + 1)  # last one is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.last = 0.0
+        self.peak_bytes = None
+        self.max_peak_bytes = None
+
+    def observe(self, seconds, peak_bytes=None):
+        i = 0
+        while i < len(BUCKETS) and seconds > BUCKETS[i]:
+            i += 1
+        self.buckets[i] += 1
+        self.count += 1
+        self.sum += seconds
+        self.last = seconds
+        if peak_bytes is not None:
+            self.peak_bytes = peak_bytes
+            self.max_peak_bytes = max(self.max_peak_bytes or 0, peak_bytes)
+
+    def quantile(self, q):
+        # same linear interpolation as Prometheus' histogram_quantile()
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            if seen + n >= rank and n:
+                lo = BUCKETS[i - 1] if i else 0.0
+                hi = BUCKETS[i] if i < len(BUCKETS) else BUCKETS[-1]
+                return lo + (hi - lo) * (rank - seen) / n
+            seen += n
+        return BUCKETS[-1]
+
+
+def observe(app, stage, seconds, peak_bytes=None):
+    with _lock:
+        stats = _stages.get((app, stage))
+        if stats is None:
+            stats = _stages[(app, stage)] = StageStats()
+        stats.observe(seconds, peak_bytes)
+
+
+def snapshot():
+    with _lock:
+        return {key: (s.count, s.sum, list(s.buckets), s.last, s.peak_bytes, s.max_peak_bytes,
+                      s.quantile(0.5), s.quantile(0.95))
+                for key, s in _stages.items()}
+
+
+# ===================== RUN (LAP TIMER) =====================
+class Run:
+    """One pass through an app script; every lap becomes a stage sample."""
+
+    def __init__(self, app, trace_memory=False):
+        self.app = app
+        self.laps = []
+        self.trace_memory = trace_memory or os.environ.get("CAREER_TRACEMALLOC") == "1"
+        self._untrace = None
+        if self.trace_memory:
+            _trace()
+            # a rerun can interrupt the script before finish(), so also release on collection
+            self._untrace = weakref.finalize(self, _untrace)
+        self._reset()
+
+    def _reset(self):
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        self._start = time.perf_counter()
+
+    def skip(self):
+        # restart the clock without recording, e.g. across widget creation
+        self._reset()
+
+    def lap(self, stage):
+        seconds = time.perf_counter() - self._start
+        peak = tracemalloc.get_traced_memory()[1] if self.trace_memory else None
+        observe(self.app, stage, seconds, peak)
+        self.laps.append((stage, seconds, peak))
+        self._reset()
+
+    def finish(self, path=PROM_PATH):
+        if self._untrace is not None:
+            self._untrace()
+        if path:
+            write_prometheus(path, WRITE_INTERVAL)
+
+
+def _trace():
+    global _tracing
+    with _lock:
+        _tracing += 1
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+
+def _untrace():
+    global _tracing
+    with _lock:
+        _tracing -= 1
+        if not _tracing and os.environ.get("CAREER_TRACEMALLOC") != "1":
+            tracemalloc.stop()
+
+
+# ===================== PROMETHEUS EXPORT =====================
+def _labels(app, stage, **extra):
+    pairs = {"app": app, "stage": stage, **extra}
+    return ",".join(f'{k}="{v}"' for k, v in pairs.items())
+
+
+def render_prometheus():
+    lines = [
+        "# HELP career_stage_seconds Time spent in each app pipeline stage.",
+        "# TYPE career_stage_seconds histogram",
+    ]
+    peaks = []
+    for (app, stage), (count, total, buckets, _, peak, max_peak, _, _) in sorted(snapshot().items()):
+        cumulative = 0
+        for le, n in zip([*(f"{b:g}" for b in BUCKETS), "+Inf"], buckets):
+            cumulative += n
+            lines.append(f"career_stage_seconds_bucket{{{_labels(app, stage, le=le)}}} {cumulative}")
+        lines.append(f"career_stage_seconds_sum{{{_labels(app, stage)}}} {total:.6f}")
+        lines.append(f"career_stage_seconds_count{{{_labels(app, stage)}}} {count}")
+        if max_peak is not None:
+            peaks.append((app, stage, peak, max_peak))
+    if peaks:
+        lines += [
+            "# HELP career_stage_peak_bytes Peak traced memory during the last run of a stage.",
+            "# TYPE career_stage_peak_bytes gauge",
+        ]
+        lines += [f"career_stage_peak_bytes{{{_labels(app, stage)}}} {peak}" for app, stage, peak, _ in peaks]
+        lines += [
+            "# HELP career_stage_max_peak_bytes Highest peak traced memory seen for a stage.",
+            "# TYPE career_stage_max_peak_bytes gauge",
+        ]
+        lines += [f"career_stage_max_peak_bytes{{{_labels(app, stage)}}} {m}" for app, stage, _, m in peaks]
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(path=PROM_PATH, min_interval=0.0):
+    # atomic replace, so a scraper never reads a half-written file; skipped
+    # while the last write is younger than min_interval or nothing changed
+    now = time.perf_counter()
+    with _lock:
+        samples = sum(s.count for s in _stages.values())
+        last, written = _written.get(path, (None, None))
+        if written == samples or (last is not None and now - last < min_interval):
+            return False
+        _written[path] = (now, samples)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(render_prometheus())
+    os.replace(tmp, path)
+    return True
+
+
+@atexit.register
+def _flush():
+    for path in list(_written):
+        write_prometheus(path)
+
+
+# ===================== DEBUG PANEL =====================
+def debug_requested():
+    import streamlit as st
+
+    return st.query_params.get("debug") == "1"
+
+
+def debug_panel(run):
+    import pandas as pd
+    import streamlit as st
+
+    with st.expander("🛠️ Pipeline metrics", expanded=True):
+        st.markdown("**This run**")
+        st.dataframe(pd.DataFrame(
+            [{"stage": s, "ms": round(sec * 1000, 2), "peak KB": None if p is None else round(p / 1024, 1)}
+             for s, sec, p in run.laps]
+        ), hide_index=True)
+        st.markdown("**All runs in this process**")
+        rows = []
+        for (app, stage), (count, total, _, last, _, max_peak, p50, p95) in sorted(snapshot().items()):
+            if app != run.app:
+                continue
+            rows.append({
+                "stage": stage, "runs": count, "mean ms": round(total / count * 1000, 2),
+                "p50 ms": round(p50 * 1000, 2), "p95 ms": round(p95 * 1000, 2),
+                "max peak KB": None if max_peak is None else round(max_peak / 1024, 1),
+            })
+        st.dataframe(pd.DataFrame(rows), hide_index=True)
+        st.caption(f"Prometheus file: {PROM_PATH}")
@@ -0,0 +1,17 @@
+# ===================== IMPORTS =====================
+import streamlit as st
+
+# Streamlit sends every element to the browser as soon as it is created, so
+# the result cards are visible while the slower sections are still being
+# built. reserve() puts a loading note in each slot up front; the page keeps
+# its layout and each slot is replaced with its content once it is ready.
+
+
+# ===================== PLACEHOLDERS =====================
+def reserve(*labels):
+    slots = []
+    for label in labels:
+        slot = st.empty()
+        slot.caption(f"⏳ Loading {label}…")
+        slots.append(slot)
+    return slots
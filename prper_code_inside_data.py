@@ -2,8 +2,12 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from tfidf_model import load_or_fit
+from skill_vocab import canonical_set, canonical_skills, canonical_text
+from charts import cached_figure, chart_key, downsample
+from progressive import reserve
+from metrics import Run, debug_panel, debug_requested
+from report_cache import catalog_version
 
 # ===================== PAGE CONFIG =====================
 st.set_page_config(
@@ -71,6 +75,8 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # ===================== DATA =====================
+debug = debug_requested()
+run = Run("tfidf", trace_memory=debug)
 data = {
     "Career": [
         "Data Scientist","Web Developer","AI Engineer","UI/UX Designer",
@@ -115,13 +121,16 @@ data = {
 }
 
 df = pd.DataFrame(data)
+catalog_id = catalog_version(df)
+run.lap("load")
 
 # ===================== FUNCTIONS =====================
+@st.cache_resource
+def load_tfidf(skills):
+    return load_or_fit([canonical_text(s) for s in skills])
+
 def similarity(user, skills):
-    vec = TfidfVectorizer()
-    m = vec.fit_transform(skills)
-    u = vec.transform([user])
-    return cosine_similarity(u, m).flatten()
+    return load_tfidf(tuple(skills)).similarity(canonical_text(user))
 
 def badge(score):
     if score >= 80:
@@ -132,27 +141,32 @@ def badge(score):
         return "⚠️ Needs Improvement"
 
 def missing(user_set, req):
-    return set(s.strip().lower() for s in req.split(",")) - user_set
+    return canonical_skills(req) - canonical_set(user_set)
 
 def radar_chart(row, user_set):
-    req = set(s.strip().lower() for s in row["Required_Skills"].split(","))
-    skills = list(req | user_set)
-    df_radar = pd.DataFrame({
-        "Skill": skills * 2,
-        "Value": [1 if s in user_set else 0 for s in skills] +
-                 [1 if s in req else 0 for s in skills],
-        "Type": ["You"]*len(skills) + ["Required"]*len(skills)
-    })
-    fig = px.line_polar(
-        df_radar,
-        r="Value",
-        theta="Skill",
-        color="Type",
-        line_close=True,
-        color_discrete_sequence=px.colors.sequential.Plasma
-    )
-    fig.update_traces(fill="toself", marker_size=6)
-    fig.update_layout(margin=dict(l=30,r=30,t=30,b=30))
+    req = canonical_skills(row["Required_Skills"])
+    user = canonical_set(user_set)
+
+    def build():
+        skills = list(req | user)
+        df_radar = pd.DataFrame({
+            "Skill": skills * 2,
+            "Value": [1 if s in user else 0 for s in skills] +
+                     [1 if s in req else 0 for s in skills],
+            "Type": ["You"]*len(skills) + ["Required"]*len(skills)
+        })
+        fig = px.line_polar(
+            df_radar,
+            r="Value",
+            theta="Skill",
+            color="Type",
+            line_close=True,
+            color_discrete_sequence=px.colors.sequential.Plasma
+        )
+        fig.update_traces(fill="toself", marker_size=6)
+        return fig.update_layout(margin=dict(l=30,r=30,t=30,b=30))
+
+    fig = cached_figure(("tfidf.radar", canonical_text(req), canonical_text(user)), build)
     st.plotly_chart(fig, use_container_width=True)
 
 # ===================== UI =====================
@@ -162,6 +176,7 @@ st.write("AI-powered career recommendation with skill gap analysis")
 # Multiselect dropdown for skills
 all_skills = sorted({skill.strip() for req in df['Required_Skills'] for skill in req.split(',')})
 user_skills = set(st.multiselect("🧠 Select your skills", all_skills, default=["Python","SQL","HTML"]))
+run.skip()
 
 if st.button("🚀 Analyze My Career"):
 
@@ -170,7 +185,9 @@ if st.button("🚀 Analyze My Career"):
     else:
         user_input_str = ', '.join(user_skills)
         df["Match_Score"] = similarity(user_input_str, df["Required_Skills"]) * 100
+        run.lap("score")
         df = df.sort_values("Match_Score", ascending=False).reset_index(drop=True)
+        run.lap("rank")
 
         # ===================== TOP 3 CARDS =====================
         st.markdown("## 🏆 Top 3 Matches")
@@ -198,59 +215,71 @@ if st.button("🚀 Analyze My Career"):
                 </div>
                 """, unsafe_allow_html=True)
 
+        run.lap("cards")
+
         # ===================== ANALYTICS =====================
         st.markdown("---")
 
+        # the cards above are already on screen; the charts fill these slots in order
+        bar_slot, radar_slot, pie_slot, line_slot = reserve(
+            "match overview", "skill gap radar", "top 3 distribution", "match trend")
+
         # -------- ORIGINAL BAR CHART --------
-        st.markdown("### 📊 Career Match Overview")
-        fig_bar = px.bar(
-            df.head(7),
-            x="Match_Score",
-            y="Career",
-            orientation="h",
-            color="Match_Score",
-            color_continuous_scale=px.colors.sequential.Plasma,
-            text=df["Match_Score"].apply(lambda x: f"{x:.2f}%")
-        )
-        fig_bar.update_layout(yaxis={'categoryorder': 'total ascending'}, height=400)
-        st.plotly_chart(fig_bar, use_container_width=True)
+        with bar_slot.container():
+            st.markdown("### 📊 Career Match Overview")
+            fig_bar = cached_figure(chart_key("tfidf.bar", user_skills, catalog_id), lambda: px.bar(
+                df.head(7),
+                x="Match_Score",
+                y="Career",
+                orientation="h",
+                color="Match_Score",
+                color_continuous_scale=px.colors.sequential.Plasma,
+                text=df["Match_Score"].apply(lambda x: f"{x:.2f}%")
+            ).update_layout(yaxis={'categoryorder': 'total ascending'}, height=400))
+            st.plotly_chart(fig_bar, use_container_width=True)
 
         # -------- ORIGINAL RADAR CHART --------
-        st.markdown("### 🎯 Deep Dive: Top Career")
-        radar_chart(df.iloc[0], user_skills)
+        with radar_slot.container():
+            st.markdown("### 🎯 Deep Dive: Top Career")
+            radar_chart(df.iloc[0], user_skills)
 
         # -------- NEW PIE CHART --------
-        st.markdown("### 🥧 Top 3 Career Match Distribution")
-        top3 = df.head(3).sort_values("Match_Score", ascending=False)  # sorted descending
-        fig_pie = px.pie(
-            top3,
-            names='Career',
-            values='Match_Score',
-            color='Career',
-            color_discrete_sequence=px.colors.qualitative.Bold,
-            hole=0.4
-        )
-        fig_pie.update_traces(
-            texttemplate='%{value:.2f}%',
-            textposition='inside',
-            hovertemplate='%{label}: %{value:.2f}%<extra></extra>'
-        )
-        st.plotly_chart(fig_pie, use_container_width=True)
+        with pie_slot.container():
+            st.markdown("### 🥧 Top 3 Career Match Distribution")
+            top3 = df.head(3).sort_values("Match_Score", ascending=False)  # sorted descending
+            fig_pie = cached_figure(chart_key("tfidf.pie", user_skills, catalog_id), lambda: px.pie(
+                top3,
+                names='Career',
+                values='Match_Score',
+                color='Career',
+                color_discrete_sequence=px.colors.qualitative.Bold,
+                hole=0.4
+            ).update_traces(
+                texttemplate='%{value:.2f}%',
+                textposition='inside',
+                hovertemplate='%{label}: %{value:.2f}%<extra></extra>'
+            ))
+            st.plotly_chart(fig_pie, use_container_width=True)
 
         # -------- NEW LINE CHART --------
-        st.markdown("### 📈 All Career Match Trend")
-        fig_line = px.line(
-            df,
-            x='Career',
-            y='Match_Score',
-            markers=True,
-            text=df['Match_Score'].apply(lambda x: f"{x:.2f}%"),
-            color_discrete_sequence=['#ff5722']
-        )
-        fig_line.update_traces(marker=dict(size=10))
-        fig_line.update_layout(xaxis_title="Career", yaxis_title="Match Score (%)")
-        st.plotly_chart(fig_line, use_container_width=True)
+        with line_slot.container():
+            st.markdown("### 📈 All Career Match Trend")
+            # every career: top half verbatim, the tail averaged into rank buckets
+            trend = downsample(df, "Career", "Match_Score")
+            fig_line = cached_figure(chart_key("tfidf.line", user_skills, catalog_id), lambda: px.line(
+                trend,
+                x='Career',
+                y='Match_Score',
+                markers=True,
+                text=trend['Match_Score'].apply(lambda x: f"{x:.2f}%"),
+                color_discrete_sequence=['#ff5722']
+            ).update_traces(marker=dict(size=10)).update_layout(xaxis_title="Career", yaxis_title="Match Score (%)"))
+            st.plotly_chart(fig_line, use_container_width=True)
+        run.lap("charts")
 
 # ===================== FOOTER =====================
+run.finish()
 st.markdown("---")
 st.caption("Built with ❤️ by Rohit | Career Guide AI v5.4")
+if debug:
+    debug_panel(run)
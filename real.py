@@ -1,9 +1,18 @@
 # ===================== IMPORTS =====================
+import hashlib
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from catalog import CATALOG_PATH, badge, missing
+from skill_vocab import canonical_set, canonical_skills, canonical_text
+from charts import cached_figure, chart_key
+from progressive import reserve
+from data_layer import load_data
+from metrics import Run, debug_panel, debug_requested
+from result_cache import Result, ResultCache, result_key
+from disk_cache import DiskCache
+from resume_skills import SkillMatcher, extract_text
+from roadmap import SkillRoadmap
 
 # ===================== PAGE CONFIG =====================
 st.set_page_config(
@@ -59,98 +68,110 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# ===================== LOAD CSV DATA =====================
-df = pd.read_csv("career_dataset_100.csv", encoding="latin1")
+# ===================== LOAD CATALOG (SHARED ACROSS SESSIONS) =====================
+# compiled catalog, TF-IDF model and hybrid index are built once per process
+# and rebuilt only when the CSV changes
+debug = debug_requested()
+run = Run("real", trace_memory=debug)
+data, load_info = load_data(CATALOG_PATH)
+catalog = data.catalog
+run.lap("load")
 
-df["Salary"] = (
-    df["Salary"]
-    .astype(str)
-    .str.replace("–", "-", regex=False)
-)
-df["Salary"] = "₹" + df["Salary"]
-df.columns = df.columns.str.strip()
-
-# ===================== RULE-BASED MATCH LOGIC =====================
-def rule_based_score(user_skills, required_skills):
-    user = set(s.lower() for s in user_skills)
-    req = set(s.strip().lower() for s in required_skills.split(","))
-    return (len(user & req) / len(req)) * 100 if req else 0
-
-# ===================== BADGE =====================
-def badge(score):
-    if score >= 80:
-        return "🏆 Excellent Fit"
-    elif score >= 60:
-        return "🔥 Good Fit"
-    else:
-        return "⚠️ Needs Improvement"
+@st.cache_resource
+def load_result_cache():
+    # memory first, then the SQLite tier shared with the other app processes
+    return ResultCache(backing=DiskCache())
+
+@st.cache_resource
+def load_matcher(version):
+    return SkillMatcher.from_vocab(data.engine.vocab)
+
+@st.cache_data(max_entries=64)
+def resume_skills(version, digest, name, _data):
+    # parsed once per uploaded file (by content hash), not on every rerun
+    return [data.engine.vocab.display[j] for j in load_matcher(version).skill_ids(extract_text(name, _data))]
+
+@st.cache_resource
+def load_roadmap(version):
+    return SkillRoadmap(data.engine)
+
+@st.cache_data(max_entries=256)
+def skill_plan(version, user_skills, target, k):
+    # every widget change reruns the script; a plan is only searched again when its inputs change
+    return load_roadmap(version).plan(user_skills, target, k)
 
-# ===================== MISSING SKILLS =====================
-def missing(user_set, req):
-    user_lower = set(s.lower() for s in user_set)
-    req_lower = set(s.strip().lower() for s in req.split(","))
-    return req_lower - user_lower
+def rank_careers(user_skills):
+    top_ids, top_scores = data.hybrid_index.top_k(data.hybrid_query(user_skills), 10)
+    gaps = [missing(user_skills, req) for req in catalog.rows(top_ids)["Required_Skills"]]
+    return Result(top_ids, top_scores, gaps)
 
 # ===================== RADAR CHART =====================
 def radar_chart(row, user_set):
-    req = set(s.strip().lower() for s in row["Required_Skills"].split(","))
-    skills = list(req | set(s.lower() for s in user_set))
-
-    df_radar = pd.DataFrame({
-        "Skill": skills * 2,
-        "Value": [1 if s in set(x.lower() for x in user_set) else 0 for s in skills] +
-                 [1 if s in req else 0 for s in skills],
-        "Type": ["You"] * len(skills) + ["Required"] * len(skills)
-    })
-
-    fig = px.line_polar(
-        df_radar,
-        r="Value",
-        theta="Skill",
-        color="Type",
-        line_close=True,
-        color_discrete_sequence=px.colors.sequential.Plasma
-    )
-    fig.update_traces(fill="toself")
+    req = canonical_skills(row["Required_Skills"])
+    user = canonical_set(user_set)
+
+    def build():
+        skills = list(req | user)
+        df_radar = pd.DataFrame({
+            "Skill": skills * 2,
+            "Value": [1 if s in user else 0 for s in skills] +
+                     [1 if s in req else 0 for s in skills],
+            "Type": ["You"] * len(skills) + ["Required"] * len(skills)
+        })
+        fig = px.line_polar(
+            df_radar,
+            r="Value",
+            theta="Skill",
+            color="Type",
+            line_close=True,
+            color_discrete_sequence=px.colors.sequential.Plasma
+        )
+        return fig.update_traces(fill="toself")
+
+    fig = cached_figure(("hybrid.radar", canonical_text(req), canonical_text(user)), build)
     st.plotly_chart(fig, use_container_width=True)
 
 # ===================== UI =====================
 st.title("🎯 Career Guide AI")
 st.write("AI-powered career recommendation with skill gap analysis")
 
-all_skills = sorted({skill.strip() for req in df['Required_Skills'] for skill in req.split(',')})
+all_skills = data.skill_labels
 user_skills = set(st.multiselect("🧠 Select your skills", all_skills, default=["Python", "SQL", "HTML"]))
+resume = st.file_uploader("📄 Or add the skills from your resume", type=["pdf", "docx", "txt"])
+run.skip()
+if resume is not None:
+    resume_data = resume.getvalue()
+    try:
+        found = resume_skills(data.version, hashlib.sha256(resume_data).hexdigest(), resume.name, resume_data)
+    except RuntimeError as exc:
+        st.warning(f"⚠️ {exc}")
+    else:
+        user_skills |= set(found)
+        st.caption("📄 Found in resume: " + (", ".join(found) if found else "no catalog skills"))
+    run.lap("resume")
 
 if st.button("🚀 Analyze My Career"):
 
     if not user_skills:
         st.warning("⚠️ Please select at least one skill!")
     else:
-        # ===================== RULE-BASED SCORE =====================
-        df["Rule_Score"] = df["Required_Skills"].apply(
-            lambda x: rule_based_score(user_skills, x)
-        )
-
-        # ===================== ML SCORE (TF-IDF) =====================
-        vectorizer = TfidfVectorizer()
-        skill_matrix = vectorizer.fit_transform(df["Required_Skills"])
-        user_vector = vectorizer.transform([", ".join(user_skills)])
-        ml_scores = cosine_similarity(user_vector, skill_matrix).flatten()
-
-        df["ML_Score"] = ml_scores * 100
-
-        # ===================== HYBRID FINAL SCORE =====================
-        df["Match_Score"] = (0.7 * df["Rule_Score"]) + (0.3 * df["ML_Score"])
-
-        df = df.sort_values("Match_Score", ascending=False).reset_index(drop=True)
+        # ===================== HYBRID FINAL SCORE (TOP-K) =====================
+        # same skill set + same catalog -> served from the shared result cache
+        key = result_key(data.engine.user_ids(user_skills), data.version, "hybrid", 10)
+        run.lap("normalize")
+        result = load_result_cache().get_or_compute(key, lambda: rank_careers(user_skills))
+        run.lap("score")
+        df = catalog.rows(list(result.ids))
+        df["Match_Score"] = result.scores
+        run.lap("rank")
 
         # ===================== TOP 3 CARDS =====================
         st.markdown("## 🏆 Top 3 Matches")
         c1, c2, c3 = st.columns(3)
 
-        for col, (_, row) in zip([c1, c2, c3], df.head(3).iterrows()):
+        for col, (i, row) in zip([c1, c2, c3], df.head(3).iterrows()):
             with col:
-                miss = missing(user_skills, row["Required_Skills"])
+                miss = result.gaps[i]
                 miss_text = " • ".join(skill.title() for skill in miss) if miss else ""
 
                 salary_html = f"""
@@ -185,41 +206,84 @@ if st.button("🚀 Analyze My Career"):
                 </div>
                 """, unsafe_allow_html=True)
 
+        run.lap("cards")
+
         # ===================== ANALYTICS =====================
         st.markdown("---")
 
-        st.markdown("### 📊 Career Match Overview")
-        fig_bar = px.bar(
-            df.head(7),
-            x="Match_Score",
-            y="Career",
-            orientation="h",
-            color="Match_Score",
-            color_continuous_scale=px.colors.sequential.Plasma
-        )
-        st.plotly_chart(fig_bar, use_container_width=True)
+        # the cards above are already on screen; the charts fill these slots in order
+        bar_slot, radar_slot, pie_slot, line_slot = reserve(
+            "match overview", "skill gap radar", "top 3 distribution", "match trend")
 
-        st.markdown("### 🎯 Deep Dive: Top Career")
-        radar_chart(df.iloc[0], user_skills)
+        with bar_slot.container():
+            st.markdown("### 📊 Career Match Overview")
+            fig_bar = cached_figure(chart_key("hybrid.bar", user_skills, data.version), lambda: px.bar(
+                df.head(7),
+                x="Match_Score",
+                y="Career",
+                orientation="h",
+                color="Match_Score",
+                color_continuous_scale=px.colors.sequential.Plasma
+            ))
+            st.plotly_chart(fig_bar, use_container_width=True)
 
-        st.markdown("### 🥇🥈🥉 Top 3 Career Match Distribution")
-        fig_pie = px.pie(
-            df.head(3),
-            names='Career',
-            values='Match_Score',
-            hole=0.4
-        )
-        st.plotly_chart(fig_pie, use_container_width=True)
-
-        st.markdown("### 📈 Top 10 Career Match Trend")
-        fig_line = px.line(
-            df.head(10),
-            x='Career',
-            y='Match_Score',
-            markers=True
-        )
-        st.plotly_chart(fig_line, use_container_width=True)
+        with radar_slot.container():
+            st.markdown("### 🎯 Deep Dive: Top Career")
+            radar_chart(df.iloc[0], user_skills)
+
+        with pie_slot.container():
+            st.markdown("### 🥇🥈🥉 Top 3 Career Match Distribution")
+            fig_pie = cached_figure(chart_key("hybrid.pie", user_skills, data.version), lambda: px.pie(
+                df.head(3),
+                names='Career',
+                values='Match_Score',
+                hole=0.4
+            ))
+            st.plotly_chart(fig_pie, use_container_width=True)
+
+        with line_slot.container():
+            st.markdown("### 📈 Top 10 Career Match Trend")
+            fig_line = cached_figure(chart_key("hybrid.line", user_skills, data.version), lambda: px.line(
+                df.head(10),
+                x='Career',
+                y='Match_Score',
+                markers=True
+            ))
+            st.plotly_chart(fig_line, use_container_width=True)
+        run.lap("charts")
+
+# ===================== SKILL ROADMAP =====================
+# searches the whole catalog, not just the cards above, for the shortest list
+# of skills that lifts k careers to the chosen badge
+if user_skills:
+    st.markdown("---")
+    st.markdown("## 🗺️ Your Skill Roadmap")
+    r1, r2 = st.columns(2)
+    target = r1.selectbox("Goal", [80, 60], format_func=lambda t: f"{badge(t)} (skill match ≥ {t}%)")
+    k = r2.slider("Number of careers", 1, 10, 1)
+    plan = skill_plan(data.version, tuple(sorted(user_skills)), target, k)
+    shown = list(dict.fromkeys(c for step in plan["steps"] for c in step["careers"][:3]))
+    names = dict(zip(shown, catalog.rows(shown)["Career"]))
+    if not plan["reachable"]:
+        st.warning(f"⚠️ No plan reaches {badge(target)} in {k} careers")
+    elif not plan["steps"]:
+        st.success(f"🎉 You already reach {badge(target)} in {len(plan['careers'])} careers!")
+    for n, step in enumerate(plan["steps"], 1):
+        unlocked = ", ".join(names[c] for c in step["careers"][:3])
+        if len(step["careers"]) > 3:
+            unlocked += f" and {len(step['careers']) - 3} more"
+        st.markdown(f"**{n}. {step['skill']}**" + (f" → unlocks {unlocked}" if unlocked else ""))
+    if plan["steps"]:
+        st.caption("Shortest possible plan" if plan["optimal"] else
+                   f"At least {plan['lower_bound']} skills are needed; this plan may not be the shortest")
+    run.lap("roadmap")
 
 # ===================== FOOTER =====================
+run.finish()
 st.markdown("---")
+if debug:
+    debug_panel(run)
+    st.caption(load_info.describe())
+    st.caption(f"Result cache: {load_result_cache().stats()}")
+    st.caption(f"Disk cache: {load_result_cache().backing.stats()}")
 st.caption("Built with ❤️ by Rohit | Career Guide AI v6.0 (Hybrid ML)")
@@ -0,0 +1,107 @@
+# ===================== IMPORTS =====================
+import numpy as np
+
+from catalog import CATALOG_PATH, load_catalog, badge
+from hybrid_kernel import HybridKernel
+from scoring_engine import SkillScoringEngine, top_k_rows
+from lsh_index import MinHashLSH
+from roadmap import SkillRoadmap
+from skill_vocab import canonical_text
+from tfidf_model import load_or_fit
+
+MODES = ("rule", "hybrid", "approx")
+BLOCK_CELLS = 1 << 24  # profiles x careers scored per sparse product
+
+
+# ===================== RECOMMENDER =====================
+class Recommender:
+    """Headless version of the app scoring: what the Streamlit cards show.
+
+    ``rule`` is matched/required (career_guide_ai_modern.py), ``hybrid`` is
+    0.7 * rule + 0.3 * TF-IDF (real.py, one fused product), ``approx`` is the rule score over
+    the careers a MinHash LSH index retrieves (for very large catalogs).
+    """
+
+    modes = MODES
+
+    def __init__(self, df, engine, tfidf=None):
+        self.df = df
+        self.engine = engine
+        self.tfidf = tfidf
+        self.careers = df["Career"].tolist()
+        self.salaries = df["Salary"].tolist()
+        self.learn_links = df["Learn_Link"].tolist()
+        self.skill_names = engine.skill_names
+        self._lsh = None
+        self._hybrid = None
+        self._roadmap = None
+
+    @property
+    def n_careers(self):
+        return self.engine.n_careers
+
+    @property
+    def hybrid(self):
+        if self.tfidf is None:
+            raise ValueError("hybrid mode needs the TF-IDF model")
+        if self._hybrid is None:
+            self._hybrid = HybridKernel(self.engine, self.tfidf)
+        return self._hybrid
+
+    @property
+    def lsh(self):
+        if self._lsh is None:
+            self._lsh = MinHashLSH(self.engine)
+        return self._lsh
+
+    @property
+    def roadmap(self):
+        if self._roadmap is None:
+            self._roadmap = SkillRoadmap(self.engine)
+        return self._roadmap
+
+    @classmethod
+    def load(cls, path=CATALOG_PATH, hybrid=True):
+        df = load_catalog(path)
+        engine = SkillScoringEngine.from_skills(df["Required_Skills"])
+        tfidf = load_or_fit([canonical_text(req) for req in df["Required_Skills"]]) if hybrid else None
+        return cls(df, engine, tfidf)
+
+    def score_many(self, profiles, mode="hybrid"):
+        if mode == "rule":
+            return self.engine.score_many(profiles)
+        return self.hybrid.score_many(profiles)
+
+    def describe(self, career, score, user_ids):
+        gaps = sorted(self.skill_names[j] for j in self.engine.required_ids(career) if j not in user_ids)
+        return {
+            "career": self.careers[career],
+            "match_score": round(float(score), 4),
+            "badge": badge(score),
+            "missing_skills": gaps,
+            "salary": self.salaries[career],
+            "learn_link": self.learn_links[career],
+        }
+
+    def top_many(self, profiles, k=3, mode="hybrid"):
+        # -> (profiles x k career ids, profiles x k scores)
+        if mode not in MODES:
+            raise ValueError(f"unknown mode {mode!r}, expected one of {MODES}")
+        if mode == "approx":
+            found = [self.lsh.top_k(user_skills, k) for user_skills in profiles]
+            return np.array([ids for ids, _ in found]), np.array([s for _, s in found])
+        # blocks bound the product's size: a common skill overlaps a large
+        # share of a big catalog, so each row can hold most of the careers
+        block = max(1, BLOCK_CELLS // max(self.n_careers, 1))
+        parts = [top_k_rows(self.score_many(profiles[i:i + block], mode), k)
+                 for i in range(0, max(len(profiles), 1), block)]
+        return np.concatenate([ids for ids, _ in parts]), np.concatenate([s for _, s in parts])
+
+    def recommend_many(self, profiles, k=3, mode="hybrid"):
+        # profiles: list of skill lists -> list of top-k result lists
+        top, scores = self.top_many(profiles, k, mode)
+        recs = []
+        for i, user_skills in enumerate(profiles):
+            user_ids = set(self.engine.user_ids(user_skills).tolist())
+            recs.append([self.describe(c, s, user_ids) for c, s in zip(top[i], scores[i])])
+        return recs
@@ -0,0 +1,34 @@
+# ===================== IMPORTS =====================
+from fpdf import FPDF
+
+from skill_vocab import canonical_text
+
+
+# ===================== HELPERS =====================
+def latin1(text):
+    # FPDF core fonts are latin-1 only; anything else becomes "?"
+    return str(text).encode("latin-1", "replace").decode("latin-1")
+
+
+# ===================== PDF REPORT =====================
+def generate_pdf(rows, user_skills, missing_skills):
+    # rows: mappings with Career, Match_Score, Description (best first);
+    # missing_skills: the skill gap of each row, same order
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_font("Arial", "B", 16)
+    pdf.cell(0, 10, "Career Recommendation Report", ln=True, align="C")
+    pdf.set_font("Arial", "", 12)
+    pdf.ln(5)
+    pdf.cell(0, 10, latin1(f"Your Skills: {canonical_text(user_skills)}"), ln=True)
+    pdf.ln(10)
+
+    for row, missing in zip(rows, missing_skills):
+        pdf.set_font("Arial", "B", 14)
+        pdf.cell(0, 10, latin1(f"{row['Career']} ({row['Match_Score']:.1f}%)"), ln=True)
+        pdf.set_font("Arial", "", 12)
+        pdf.multi_cell(0, 7, latin1(f"Description: {row['Description']}"))
+        pdf.multi_cell(0, 7, latin1(f"Skills to Learn: {', '.join(sorted(missing)) if missing else 'None! You are ready.'}"))
+        pdf.ln(5)
+
+    return pdf.output(dest='S').encode('latin-1')
@@ -0,0 +1,83 @@
+# ===================== IMPORTS =====================
+import hashlib
+import threading
+from collections import OrderedDict
+
+from skill_vocab import canonical_text
+
+# Rendered reports keyed by content: the same canonical skill set against the
+# same catalog version always yields the same PDF, so it is rendered once and
+# then served from memory. Eviction is least-recently-used by total bytes.
+# With a backing DiskCache, misses fall through to the on-disk tier shared by
+# all app processes.
+
+REPORT_VERSION = 1
+
+
+# ===================== KEYS =====================
+def catalog_version(df, columns=("Career", "Required_Skills", "Description")):
+    h = hashlib.sha256()
+    for col in columns:
+        for value in df[col]:
+            h.update(b"\x00")
+            h.update(str(value).encode("utf-8"))
+    return h.hexdigest()
+
+
+def report_key(user_skills, version):
+    # "Python, ML" and "machine learning,python" share a key
+    raw = f"report-v{REPORT_VERSION}\x00{version}\x00{canonical_text(user_skills)}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+# ===================== CACHE =====================
+class ReportCache:
+    """Thread-safe, size-bounded LRU of rendered report bytes."""
+
+    def __init__(self, max_bytes=64 * 2 ** 20, backing=None):
+        self.max_bytes = max_bytes
+        self.backing = backing
+        self._items = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            data = self._items.get(key)
+            if data is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return data
+
+    def put(self, key, data):
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old)
+            self._items[key] = data
+            self._bytes += len(data)
+            while self._bytes > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self._bytes -= len(evicted)
+
+    def get_or_render(self, key, render):
+        # rendering happens outside the lock; two racing renders of one key
+        # just produce the same bytes twice
+        data = self.get(key)
+        if data is None:
+            if self.backing is not None:
+                data = self.backing.get_or_compute("report", key, render)
+            else:
+                data = render()
+            self.put(key, data)
+        return data
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._items), "bytes": self._bytes, "hits": self.hits, "misses": self.misses}
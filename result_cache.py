@@ -0,0 +1,104 @@
+# ===================== IMPORTS =====================
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+# Ranked results keyed by what actually determines them: the canonical skill
+# ids, the catalog version, the scoring mode and k. The apps pick skills from
+# the catalog vocabulary, so many sessions send the same set and a hit skips
+# scoring entirely. Entries expire after a TTL and the least recently used
+# one is evicted once the cache is full. With a backing DiskCache, misses
+# fall through to the on-disk tier shared by all app processes.
+
+RESULT_VERSION = 1
+
+
+# ===================== KEYS =====================
+def result_key(skill_ids, version, mode, k):
+    return (mode, k, version, frozenset(int(j) for j in skill_ids))
+
+
+def disk_key(key):
+    mode, k, version, skill_ids = key
+    raw = f"result-v{RESULT_VERSION}\x00{mode}\x00{k}\x00{version}\x00{sorted(skill_ids)}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class Result:
+    """Ranked top-k for one skill set: career ids, scores and skill gaps."""
+
+    def __init__(self, ids, scores, gaps):
+        self.ids = tuple(int(i) for i in ids)
+        self.scores = tuple(float(s) for s in scores)
+        self.gaps = tuple(frozenset(g) for g in gaps)
+
+    def dumps(self):
+        return json.dumps([self.ids, self.scores, [sorted(g) for g in self.gaps]]).encode("utf-8")
+
+    @classmethod
+    def loads(cls, data):
+        return cls(*json.loads(data))
+
+
+# ===================== CACHE =====================
+class ResultCache:
+    """Thread-safe LRU of Results with a time-to-live, shared by all sessions."""
+
+    def __init__(self, max_entries=4096, ttl=3600.0, backing=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.backing = backing
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evicted = 0
+
+    def get(self, key):
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None and time.monotonic() - item[0] > self.ttl:
+                del self._items[key]
+                self.expired += 1
+                item = None
+            if item is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return item[1]
+
+    def put(self, key, result):
+        with self._lock:
+            self._items.pop(key, None)
+            self._items[key] = (time.monotonic(), result)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+                self.evicted += 1
+
+    def get_or_compute(self, key, compute):
+        # computed outside the lock; racing sessions store equal results
+        result = self.get(key)
+        if result is None:
+            if self.backing is not None:
+                result = self.backing.get_or_compute("result", disk_key(key), compute, Result.dumps, Result.loads)
+            else:
+                result = compute()
+            self.put(key, result)
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._items), "hits": self.hits, "misses": self.misses,
+                "expired": self.expired, "evicted": self.evicted,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,180 @@
+# ===================== IMPORTS =====================
+import argparse
+import html
+import io
+import json
+import re
+import zipfile
+from collections import deque
+
+from skill_vocab import ALIASES
+
+# Skill extraction from resumes with an Aho-Corasick automaton.
+#
+#   python resume_skills.py resumes/*.pdf --top-k 3 > results.jsonl
+#
+# Every spelling of every catalog skill (canonical name, display name,
+# aliases) is compiled into one automaton, so a resume is scanned once,
+# character by character, whatever the size of the vocabulary. A hit counts
+# only on word boundaries ("java" does not match inside "javascript"), and of
+# overlapping hits the leftmost, then longest, wins ("react native" rather
+# than "react"). Spellings of one or two characters ("R", "C", "AI", "ML")
+# must contain a capital letter in the resume, so English words like "go" or
+# "ai" in running text do not match, and must not touch a JOINERS character
+# either, so "R&D" or "A/B" do not match "R" or "B".
+
+SHORT = 2
+JOINERS = "&/-"
+_WHITESPACE = re.compile(r"\s+")
+_XML_TAG = re.compile(r"<[^>]+>")
+# a DOCX word can be split over several runs (<w:r><w:t>Py</w:t></w:r><w:r>...),
+# so tags are dropped without a separator and only these become whitespace
+_DOCX_BREAK = re.compile(r"</w:p>|<w:br\b[^>]*/>|<w:cr\b[^>]*/>")
+_DOCX_TAB = re.compile(r"<w:tab\b[^>]*/>")
+
+
+# ===================== TEXT EXTRACTION =====================
+def extract_text(name, data):
+    # uploaded file name + bytes -> plain text (PDF needs the optional pypdf)
+    lower = name.lower()
+    if lower.endswith(".pdf"):
+        try:
+            from pypdf import PdfReader
+        except ImportError as exc:
+            raise RuntimeError("reading PDF resumes needs pypdf (pip install pypdf)") from exc
+        return "\n".join(page.extract_text() or "" for page in PdfReader(io.BytesIO(data)).pages)
+    if lower.endswith(".docx"):
+        with zipfile.ZipFile(io.BytesIO(data)) as docx:
+            xml = docx.read("word/document.xml").decode("utf-8", errors="replace")
+        xml = _DOCX_TAB.sub("\t", _DOCX_BREAK.sub("\n", xml))
+        return html.unescape(_XML_TAG.sub("", xml))
+    return data.decode("utf-8", errors="replace")
+
+
+def _lower(text):
+    # lower() may change the length (e.g. "İ"), which would shift match offsets
+    low = text.lower()
+    if len(low) != len(text):
+        low = "".join(ch.lower()[:1] or ch for ch in text)
+    return low
+
+
+def _joined(ch, short):
+    return ch.isalnum() or (short and ch in JOINERS)
+
+
+# ===================== AHO-CORASICK =====================
+class SkillMatcher:
+    """Aho-Corasick automaton over all spellings of the catalog skills."""
+
+    def __init__(self, spellings, n_skills):
+        # spellings: (text, skill id) pairs
+        self.n_skills = n_skills
+        self.goto = [{}]
+        self.out = [[]]
+        for text, skill in spellings:
+            pattern = " ".join(text.lower().split())
+            if not pattern:
+                continue
+            state = 0
+            for ch in pattern:
+                nxt = self.goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[state][ch] = nxt
+                    self.goto.append({})
+                    self.out.append([])
+                state = nxt
+            hit = (len(pattern), skill, pattern[0].isalnum(), pattern[-1].isalnum())
+            if hit not in self.out[state]:
+                self.out[state].append(hit)
+
+        # failure links, breadth first; outputs of the fallback state are merged in
+        self.fail = [0] * len(self.goto)
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                fallback = self.goto[f].get(ch, 0)
+                self.fail[nxt] = fallback if fallback != nxt else 0
+                self.out[nxt] = self.out[nxt] + [h for h in self.out[self.fail[nxt]] if h not in self.out[nxt]]
+
+    @classmethod
+    def from_vocab(cls, vocab):
+        spellings = []
+        for j, (name, display) in enumerate(zip(vocab.names, vocab.display)):
+            spellings += [(name, j), (display, j)]
+            spellings += [(alias, j) for alias in ALIASES.get(name, [])]
+        return cls(spellings, len(vocab))
+
+    @property
+    def n_states(self):
+        return len(self.goto)
+
+    def scan(self, text):
+        # -> [(start, end, skill id)] longest non-overlapping word-bounded hits
+        text = _WHITESPACE.sub(" ", text)
+        low = _lower(text)
+        goto, fail, out = self.goto, self.fail, self.out
+        n = len(low)
+        hits = []
+        state = 0
+        for i, ch in enumerate(low):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for length, skill, word_start, word_end in out[state]:
+                start = i - length + 1
+                short = length <= SHORT
+                if short and text[start:i + 1] == low[start:i + 1]:
+                    continue
+                if (word_start or short) and start > 0 and _joined(low[start - 1], short):
+                    continue
+                if (word_end or short) and i + 1 < n and _joined(low[i + 1], short):
+                    continue
+                hits.append((start, i + 1, skill))
+
+        # leftmost-longest: a hit that overlaps one already kept is dropped
+        hits.sort(key=lambda h: (h[0], -(h[1] - h[0])))
+        kept = []
+        end = 0
+        for start, stop, skill in hits:
+            if start < end:
+                continue
+            kept.append((start, stop, skill))
+            end = stop
+        return kept
+
+    def skill_ids(self, text):
+        # distinct skill ids in order of first mention
+        return list(dict.fromkeys(skill for _, _, skill in self.scan(text)))
+
+
+# ===================== CLI =====================
+def main(argv=None):
+    from recommender import MODES, Recommender
+
+    parser = argparse.ArgumentParser(description="Extract catalog skills from resumes and recommend careers.")
+    parser.add_argument("resumes", nargs="+", help=".pdf (needs pypdf), .docx or text files")
+    parser.add_argument("--top-k", type=int, default=3)
+    parser.add_argument("--mode", choices=MODES, default="rule")
+    args = parser.parse_args(argv)
+
+    recommender = Recommender.load(hybrid=args.mode == "hybrid")
+    vocab = recommender.engine.vocab
+    matcher = SkillMatcher.from_vocab(vocab)
+    profiles = []
+    for path in args.resumes:
+        with open(path, "rb") as f:
+            text = extract_text(path, f.read())
+        profiles.append([vocab.display[j] for j in matcher.skill_ids(text)])
+    for path, skills, recs in zip(args.resumes, profiles, recommender.recommend_many(profiles, args.top_k, args.mode)):
+        print(json.dumps({"resume": path, "skills": skills, "results": recs}, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+# ===================== IMPORTS =====================
+import argparse
+import time
+
+import numpy as np
+from scipy import sparse
+from scipy.optimize import Bounds, LinearConstraint, milp
+
+# Skill roadmap: the fewest skills to learn so that k careers reach a target
+# rule score (80 = "🏆 Excellent Fit" in badge()).
+#
+#   python roadmap.py "Python, SQL, HTML" --target 80 -k 3
+#
+# A career with n required skills, m of them already matched, needs
+# ceil(target * n / 100) - m more of its missing skills. Picking skills so
+# that k careers get there is a partial set multicover problem, solved
+# greedily on bitsets: every candidate skill is a bitset over the careers
+# that require it, and careers are kept in one bitset per remaining deficit.
+# A skill moves the careers in (its bitset & level v) down to level v - 1, so
+# scoring every candidate is a handful of ANDs and popcounts. Each step takes
+# the skill that most lowers the sum of the k smallest deficits.
+#
+# Only the MAX_POOL careers closest to the target take part in the search
+# (no plan needs more skills than the k-th smallest deficit among them).
+# The plain greedy run is repeated, RESTARTS times, with a seeded start that
+# first finishes one of the closest careers. Each plan is pruned by reverse
+# delete. The k-th smallest deficit is a lower bound: a plan of that length
+# is optimal. Otherwise a 0/1 ILP over the careers that could still be in a
+# shorter plan (deficit below the greedy length) tries to beat it, or prove
+# that nothing shorter exists, within EXACT_SECONDS. That proof only covers
+# the pool: when careers left out of it (ties at the cut) have a deficit
+# below the plan length, the plan is not reported as optimal. The final plan
+# is reordered so that the first skills unlock the most.
+
+MAX_POOL = 2048
+RESTARTS = 8
+EXACT_SECONDS = 0.5
+
+
+def _bitsets(rows, cols, n_rows, n_bits):
+    # one bitset of n_bits per row, bit cols[i] set in row rows[i]
+    bits = np.zeros((n_rows, (n_bits + 63) // 64), dtype=np.uint64)
+    np.bitwise_or.at(bits, (rows, cols // 64), np.left_shift(np.uint64(1), (cols % 64).astype(np.uint64)))
+    return bits
+
+
+def _popcount(bits):
+    return np.bitwise_count(bits).sum(axis=-1, dtype=np.int64)
+
+
+# ===================== ROADMAP =====================
+class SkillRoadmap:
+    """Greedy bitset set cover over the careers of a SkillScoringEngine."""
+
+    def __init__(self, engine, max_pool=MAX_POOL, restarts=RESTARTS, exact_seconds=EXACT_SECONDS):
+        self.engine = engine
+        self.max_pool = max_pool
+        self.restarts = restarts
+        self.exact_seconds = exact_seconds
+        self.by_skill = engine.matrix.tocsc()
+
+    def deficits(self, matched, target):
+        # skills each career still needs; careers without skills can never score
+        need = np.ceil(self.engine.req_counts * target / 100 - 1e-9) - matched
+        need = np.maximum(need, 0).astype(np.int64)
+        need[self.engine.req_counts == 0] = np.iinfo(np.int64).max
+        return need
+
+    def plan(self, user_skills, target=80, k=1):
+        have = self.engine.user_ids(user_skills)
+        matched = self.engine.matrix @ self.engine.user_vector(user_skills)
+        need = self.deficits(matched, target)
+        k = max(1, min(k, int(np.count_nonzero(self.engine.req_counts))))
+        size = min(max(self.max_pool, k), len(need))
+        split = np.argpartition(need, size - 1)
+        pool, rest = split[:size], split[size:]
+        pool = pool[np.lexsort((pool, need[pool]))]
+        # smallest deficit outside the pool: no plan shorter than it can use those careers
+        outside = int(need[rest].min()) if len(rest) else np.iinfo(np.int64).max
+        pool = pool[self.engine.req_counts[pool] > 0]
+        lower_bound = int(need[pool[k - 1]])
+
+        # pool careers x their missing skills, renumbered locally
+        sub = self.engine.matrix[pool]
+        rows = np.repeat(np.arange(len(pool)), np.diff(sub.indptr))
+        keep = ~np.isin(sub.indices, have)
+        skills, local = np.unique(sub.indices[keep], return_inverse=True)
+        rows = rows[keep]
+        search = _Search(rows, local, len(pool), len(skills), need[pool], k)
+
+        plans = [search.greedy()]
+        for career in np.flatnonzero(need[pool] > 0)[:self.restarts]:
+            plans.append(search.greedy(focus=career))
+        reached = [search.prune(order) for order in plans if search.reaches(order)]
+        if not reached:
+            # e.g. a target above 100: no set of skills gets k careers there
+            plan = self._describe([], matched, target, k)
+            plan.update(reachable=False, lower_bound=lower_bound, optimal=False, pool=len(pool))
+            return plan
+        best = min(reached, key=len)
+        optimal = len(best) == lower_bound
+        if not optimal and self.exact_seconds:
+            shorter, optimal = search.exact(len(best), self.exact_seconds)
+            if shorter is not None:
+                best = shorter
+            optimal = optimal and outside >= len(best)
+        order = search.greedy(candidates=best)
+        plan = self._describe([int(skills[s]) for s in order], matched, target, k)
+        plan.update(reachable=True, lower_bound=lower_bound, optimal=optimal, pool=len(pool))
+        return plan
+
+    def _describe(self, skill_ids, matched, target, k):
+        # exact over the whole catalog, one skill column at a time
+        required = self.engine.req_counts
+        goal = np.ceil(required * target / 100 - 1e-9)
+        matched = matched.copy()
+        reached = (required > 0) & (matched >= goal)
+        steps = []
+        for j in skill_ids:
+            careers = self.by_skill.indices[self.by_skill.indptr[j]:self.by_skill.indptr[j + 1]]
+            matched[careers] += 1
+            now = careers[(matched[careers] >= goal[careers]) & ~reached[careers]]
+            reached[now] = True
+            steps.append({"skill": self.engine.vocab.display[j], "careers": self._ranked(now, matched).tolist()})
+        careers = np.flatnonzero(reached)
+        return {
+            "target": target,
+            "k": k,
+            "skills": [step["skill"] for step in steps],
+            "steps": steps,
+            "careers": self._ranked(careers, matched).tolist(),
+        }
+
+    def _ranked(self, careers, matched):
+        # best score first, ties in catalog order
+        scores = matched[careers] / self.engine.req_counts[careers]
+        return careers[np.lexsort((careers, -scores))]
+
+
+class _Search:
+    """Bitset state of one plan() call: pool careers by deficit, skills by career."""
+
+    def __init__(self, rows, skills, n_careers, n_skills, need, k):
+        self.k = k
+        self.need = need
+        self.rows = rows
+        self.skills = skills
+        self.by_skill = _bitsets(skills, rows, n_skills, n_careers)  # skill -> careers
+        self.by_career = _bitsets(rows, skills, n_careers, n_skills)  # career -> missing skills
+        self.n_skills = n_skills
+        levels = int(need.max()) + 1 if len(need) else 1
+        careers = np.arange(n_careers)
+        self.levels = _bitsets(need, careers, levels, n_careers)  # deficit -> careers
+
+    def greedy(self, candidates=None, focus=None):
+        # -> local skill ids in the order picked
+        levels = self.levels.copy()
+        allowed = np.ones(self.n_skills, dtype=bool) if candidates is None else np.isin(
+            np.arange(self.n_skills), list(candidates))
+        focus_mask = None
+        if focus is not None:
+            focus_mask = np.isin(np.arange(self.n_skills), self._skills_of(focus))
+        order = []
+        weights = np.arange(len(levels))
+        while True:
+            counts = _popcount(levels)
+            if counts[0] >= self.k:
+                return order
+            usable = allowed.copy()
+            usable[order] = False
+            if focus_mask is not None:
+                if levels[0, focus // 64] >> np.uint64(focus % 64) & np.uint64(1):
+                    focus_mask = None
+                else:
+                    usable &= focus_mask
+            cand = np.flatnonzero(usable)
+            if not len(cand):
+                return order
+            moved = _popcount(self.by_skill[cand, None, :] & levels[None, 1:, :])
+            after = np.repeat(counts[None, :], len(cand), axis=0)
+            after[:, 1:] -= moved
+            after[:, :-1] += moved
+            before = np.cumsum(after, axis=1) - after
+            cost = (np.clip(self.k - before, 0, after) * weights).sum(axis=1)
+            helped = moved.sum(axis=1)
+            best = np.lexsort((cand, -helped, cost))[0]
+            if helped[best] == 0:
+                return order
+            skill = cand[best]
+            shift = levels[1:] & self.by_skill[skill]
+            levels[1:] &= ~shift
+            levels[:-1] |= shift
+            order.append(int(skill))
+
+    def _skills_of(self, career):
+        bits = np.unpackbits(self.by_career[career].view(np.uint8), bitorder="little")
+        return np.flatnonzero(bits[:self.n_skills])
+
+    def reaches(self, order):
+        if not order:
+            return int(np.count_nonzero(self.need == 0)) >= self.k
+        chosen = _bitsets(np.zeros(len(order), dtype=np.int64), np.asarray(order), 1, self.n_skills)[0]
+        covered = _popcount(self.by_career & chosen)
+        return int(np.count_nonzero(covered >= self.need)) >= self.k
+
+    def prune(self, order):
+        # reverse delete: drop every skill the plan still reaches the target without
+        order = list(order)
+        for skill in reversed(list(order)):
+            trial = [s for s in order if s != skill]
+            if self.reaches(trial):
+                order = trial
+        return order
+
+    def exact(self, bound, seconds):
+        # 0/1 ILP: min sum(x) s.t. sum(x over career c's missing skills) >= need_c * y_c, sum(y) >= k;
+        # -> (a plan shorter than bound or None, whether the result is proven optimal)
+        careers = np.flatnonzero(self.need < bound)
+        if len(careers) < self.k:
+            return None, True
+        local = np.full(len(self.need), -1)
+        local[careers] = np.arange(len(careers))
+        keep = local[self.rows] >= 0
+        n_skills, n_careers = self.n_skills, len(careers)
+        covers = sparse.csr_matrix((np.ones(np.count_nonzero(keep)), (local[self.rows[keep]], self.skills[keep])),
+                                   shape=(n_careers, n_skills))
+        constraints = [
+            LinearConstraint(sparse.hstack([covers, -sparse.diags(self.need[careers].astype(np.float64))]), 0, np.inf),
+            LinearConstraint(np.r_[np.zeros(n_skills), np.ones(n_careers)][None, :], self.k, np.inf),
+            LinearConstraint(np.r_[np.ones(n_skills), np.zeros(n_careers)][None, :], 0, bound - 1),
+        ]
+        result = milp(np.r_[np.ones(n_skills), np.zeros(n_careers)], constraints=constraints,
+                      integrality=np.ones(n_skills + n_careers), bounds=Bounds(0, 1),
+                      options={"time_limit": seconds})
+        if result.status == 2:
+            return None, True
+        if result.x is None:
+            return None, False
+        order = np.flatnonzero(result.x[:n_skills] > 0.5).tolist()
+        if len(order) >= bound or not self.reaches(order):
+            return None, False
+        return order, result.status == 0
+
+
+# ===================== CLI =====================
+def _target(text):
+    value = float(text)
+    if not 0 < value <= 100:
+        raise argparse.ArgumentTypeError(f"{text} is not a score in (0, 100]")
+    return value
+
+
+def main(argv=None):
+    from recommender import Recommender
+
+    parser = argparse.ArgumentParser(description="Fewest skills to learn so that k careers reach a target score.")
+    parser.add_argument("skills", help="comma separated skills you already have")
+    parser.add_argument("--target", type=_target, default=80, help="rule score to reach (80 = Excellent Fit)")
+    parser.add_argument("-k", type=int, default=1, help="number of careers that must reach the target")
+    args = parser.parse_args(argv)
+
+    recommender = Recommender.load(hybrid=False)
+    user_skills = [s for s in args.skills.split(",") if s.strip()]
+    start = time.perf_counter()
+    plan = recommender.roadmap.plan(user_skills, args.target, args.k)
+    elapsed = (time.perf_counter() - start) * 1000
+    for n, step in enumerate(plan["steps"], 1):
+        unlocked = ", ".join(recommender.careers[c] for c in step["careers"]) or "-"
+        print(f"{n}. {step['skill']}  (reaches target: {unlocked})")
+    if not plan["reachable"]:
+        print(f"no plan reaches {args.target:g} in {plan['k']} careers")
+        return
+    if not plan["steps"]:
+        print("already there")
+    bound = "optimal" if plan["optimal"] else f"lower bound {plan['lower_bound']}"
+    print(f"{len(plan['steps'])} skills ({bound}), {len(plan['careers'])} careers at {args.target:g}+, "
+          f"{elapsed:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
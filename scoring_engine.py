@@ -0,0 +1,164 @@
+# ===================== IMPORTS =====================
+import numpy as np
+from scipy import sparse
+
+from inverted_index import InvertedIndex
+from skill_vocab import SkillVocabulary
+
+
+# ===================== TOP-K PER ROW =====================
+def top_k_rows(scores, k):
+    # -> (ids, scores), both rows x k: best k columns of every row, score
+    # descending then catalog order. scores is a dense array or a sparse
+    # matrix whose missing entries score 0.
+    n_rows, n_cols = scores.shape
+    k = min(k, n_cols)
+    if k == 0:
+        return np.empty((n_rows, 0), dtype=np.int64), np.empty((n_rows, 0))
+    if sparse.issparse(scores):
+        scores = scores.tocsr()
+        rows = np.repeat(np.arange(n_rows), np.diff(scores.indptr))
+        cols, values = scores.indices, scores.data
+        nonzero = values != 0
+        rows, cols, values = rows[nonzero], cols[nonzero], values[nonzero]
+        # the k-th distinct value of a row is at most its k-th best; only
+        # entries at or above it need sorting
+        if len(rows):
+            starts = np.flatnonzero(np.r_[True, rows[1:] != rows[:-1]])
+            segment = np.repeat(np.arange(len(starts)), np.diff(np.r_[starts, len(rows)]))
+            rest = values
+            for _ in range(k):
+                floor = np.maximum.reduceat(rest, starts)
+                rest = np.where(rest < floor[segment], rest, -np.inf)
+            keep = values >= floor[segment]
+            rows, cols, values = rows[keep], cols[keep], values[keep]
+    else:
+        # only entries tied with or above each row's k-th best can be in its top k
+        kth = -np.partition(-scores, k - 1, axis=1)[:, k - 1]
+        rows, cols = np.nonzero(scores >= kth[:, None])
+        values = scores[rows, cols]
+
+    order = np.lexsort((cols, -values, rows))
+    rows, cols, values = rows[order], cols[order], values[order]
+    rank = np.arange(len(rows)) - np.searchsorted(rows, rows)
+    keep = rank < k
+    rows, rank = rows[keep], rank[keep]
+    ids = np.zeros((n_rows, k), dtype=np.int64)
+    top = np.zeros((n_rows, k))
+    ids[rows, rank] = cols[keep]
+    top[rows, rank] = values[keep]
+
+    # sparse rows with fewer than k entries: pad with zero-score columns in
+    # catalog order, which all lie among the first k columns
+    found = np.bincount(rows, minlength=n_rows)
+    short = np.flatnonzero(found < k)
+    if len(short):
+        taken = np.zeros((len(short), k), dtype=bool)
+        slot = np.arange(k)[None, :] - found[short][:, None]
+        used = ids[short]
+        mask = (slot < 0) & (used < k)
+        taken[np.nonzero(mask)[0], used[mask]] = True
+        free = np.argsort(taken, axis=1, kind="stable")
+        pad = np.take_along_axis(free, np.maximum(slot, 0), axis=1)
+        ids[short] = np.where(slot >= 0, pad, used)
+    return ids, top
+
+
+# ===================== SCORING ENGINE =====================
+class SkillScoringEngine:
+    """Career x skill incidence matrix compiled once from the catalog.
+
+    Row i is career i, column j is canonical skill j of ``vocab``. Scoring a
+    user is a single sparse mat-vec instead of re-parsing every skill string.
+    """
+
+    def __init__(self, vocab, matrix):
+        self.vocab = vocab
+        self.matrix = matrix
+        self.req_counts = np.diff(matrix.indptr).astype(np.float64)
+        self._index = None
+
+    @classmethod
+    def from_skills(cls, required_skills, vocab=None):
+        vocab = SkillVocabulary() if vocab is None else vocab
+        indptr = [0]
+        indices = []
+        for req in required_skills:
+            # aliases collapse here, so "ML, Machine Learning" is one skill
+            indices.extend({vocab.intern(s) for s in req.split(",") if s.strip()})
+            indptr.append(len(indices))
+
+        indices = np.asarray(indices, dtype=np.int32)
+        indptr = np.asarray(indptr, dtype=np.int64)
+        matrix = sparse.csr_matrix(
+            (np.ones(len(indices), dtype=np.float64), indices, indptr),
+            shape=(len(indptr) - 1, len(vocab))
+        )
+        matrix.sort_indices()
+        return cls(vocab, matrix)
+
+    @property
+    def n_careers(self):
+        return self.matrix.shape[0]
+
+    @property
+    def n_skills(self):
+        return self.matrix.shape[1]
+
+    @property
+    def skill_names(self):
+        return self.vocab.names
+
+    def required_ids(self, career):
+        start, end = self.matrix.indptr[career], self.matrix.indptr[career + 1]
+        return self.matrix.indices[start:end]
+
+    def user_ids(self, user_skills):
+        # unknown skills can never match a career, so they are simply dropped
+        ids = self.vocab.lookup_all(user_skills)
+        return np.fromiter(ids, dtype=np.int32, count=len(ids))
+
+    def user_vector(self, user_skills):
+        vec = np.zeros(self.n_skills, dtype=np.float64)
+        vec[self.user_ids(user_skills)] = 1.0
+        return vec
+
+    def matched_counts(self, user_skills):
+        return self.matrix @ self.user_vector(user_skills)
+
+    def score(self, user_skills):
+        # (matched / required) * 100 over canonical skills
+        matched = self.matched_counts(user_skills)
+        scores = np.zeros(self.n_careers, dtype=np.float64)
+        nonempty = self.req_counts > 0
+        scores[nonempty] = (matched[nonempty] / self.req_counts[nonempty]) * 100
+        return scores
+
+    def user_matrix(self, profiles):
+        # one binary row per user profile, for batched scoring
+        indptr = [0]
+        indices = []
+        for user_skills in profiles:
+            indices.extend(self.user_ids(user_skills).tolist())
+            indptr.append(len(indices))
+        return sparse.csr_matrix(
+            (np.ones(len(indices), dtype=np.float64), np.asarray(indices, dtype=np.int32), indptr),
+            shape=(len(profiles), self.n_skills)
+        )
+
+    def score_many(self, profiles):
+        # users x careers scores from one sparse matrix-matrix product; the
+        # result stays sparse (careers sharing no skill score 0)
+        scores = (self.user_matrix(profiles) @ self.matrix.T).tocsr()
+        scores.data = (scores.data / self.req_counts[scores.indices]) * 100
+        return scores
+
+    @property
+    def index(self):
+        if self._index is None:
+            self._index = InvertedIndex.from_matrix(self.matrix, doc_norms=self.req_counts, scale=100)
+        return self._index
+
+    def top_k(self, user_skills, k):
+        # same scores as score(), but only careers sharing a skill are visited
+        return self.index.top_k({int(j): 1.0 for j in self.user_ids(user_skills)}, k)
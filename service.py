@@ -0,0 +1,200 @@
+# ===================== IMPORTS =====================
+import argparse
+import json
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from catalog import CATALOG_PATH
+from catalog_db import CatalogDB
+from live_catalog import CatalogWatcher
+from recommender import Recommender
+
+# Local JSON recommendation service.
+#
+#   python service.py --port 8000
+#   curl -d '{"skills": ["Python", "SQL"], "top_k": 3}' localhost:8000/recommend
+#
+# Requests that arrive within --batch-window-ms of each other are scored
+# together with one sparse users x careers product.
+
+MAX_TOP_K = 50
+
+
+# ===================== MICRO-BATCHER =====================
+class MicroBatcher:
+    def __init__(self, recommender, max_batch=256, max_wait=0.002, workers=2):
+        self.recommender = recommender
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.pending = queue.Queue()
+        self.batches = 0
+        self.requests = 0
+        self._stats_lock = threading.Lock()
+        self._stop = False
+        self._threads = [
+            threading.Thread(target=self._run, name=f"batcher-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for t in self._threads:
+            t.start()
+
+    def submit(self, skills, k, mode):
+        future = Future()
+        self.pending.put((skills, k, mode, future))
+        return future
+
+    def close(self):
+        self._stop = True
+        for _ in self._threads:
+            self.pending.put(None)
+        for t in self._threads:
+            t.join()
+
+    def _collect(self):
+        first = self.pending.get()
+        if first is None:
+            return None
+        batch = [first]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                item = self.pending.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                self.pending.put(None)  # let the loop exit after this batch
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        while not self._stop:
+            batch = self._collect()
+            if batch is None:
+                return
+            for mode in {item[2] for item in batch}:
+                group = [item for item in batch if item[2] == mode]
+                try:
+                    k = max(item[1] for item in group)
+                    recs = self.recommender.recommend_many([item[0] for item in group], k, mode)
+                except Exception as exc:
+                    for item in group:
+                        item[3].set_exception(exc)
+                    continue
+                for item, results in zip(group, recs):
+                    item[3].set_result(results[:item[1]])
+            with self._stats_lock:
+                self.batches += 1
+                self.requests += len(batch)
+
+
+# ===================== HTTP HANDLER =====================
+class RecommendHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # headers and body go out in separate writes; without this Nagle plus
+    # delayed ACK adds ~40ms to every keep-alive response
+    disable_nagle_algorithm = True
+    batcher = None
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path != "/health":
+            return self._send_json(404, {"error": "not found"})
+        b = self.batcher
+        self._send_json(200, {
+            "status": "ok",
+            "careers": b.recommender.n_careers,
+            "requests": b.requests,
+            "batches": b.batches,
+        })
+
+    def do_POST(self):
+        if self.path != "/recommend":
+            return self._send_json(404, {"error": "not found"})
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            skills = payload.get("skills")
+            if isinstance(skills, str):
+                skills = skills.split(",")
+            if not isinstance(skills, list) or not all(isinstance(s, str) for s in skills):
+                raise ValueError("'skills' must be a list of strings")
+            skills = [s.strip() for s in skills if s.strip()]
+            k = int(payload.get("top_k", 3))
+            if not 1 <= k <= MAX_TOP_K:
+                raise ValueError(f"'top_k' must be between 1 and {MAX_TOP_K}")
+            modes = self.batcher.recommender.modes
+            mode = payload.get("mode", "hybrid" if "hybrid" in modes else modes[0])
+            if mode not in modes:
+                raise ValueError(f"'mode' must be one of {modes}")
+        except (ValueError, TypeError, AttributeError) as exc:
+            return self._send_json(400, {"error": str(exc)})
+
+        results = self.batcher.submit(skills, k, mode).result()
+        self._send_json(200, {"skills": skills, "mode": mode, "results": results})
+
+    def log_message(self, format, *args):
+        pass  # per-request access logs would dominate at high request rates
+
+
+class RecommendServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+
+# ===================== CLI =====================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve career recommendations over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--catalog", default=CATALOG_PATH)
+    parser.add_argument("--db", help="SQLite catalog built by catalog_db.py (rule mode only), instead of --catalog")
+    parser.add_argument("--batch-window-ms", type=float, default=2.0)
+    parser.add_argument("--max-batch", type=int, default=256)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--watch", action="store_true",
+                        help="hot-reload the catalog CSV when it changes (incremental index updates)")
+    parser.add_argument("--watch-interval", type=float, default=2.0)
+    args = parser.parse_args(argv)
+
+    if args.db and args.watch:
+        parser.error("--watch reloads a CSV catalog and cannot be combined with --db")
+    if args.db:
+        recommender = CatalogDB(args.db)
+    elif args.watch:
+        logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(message)s")
+        recommender = CatalogWatcher(args.catalog, args.watch_interval).start()
+    else:
+        recommender = Recommender.load(args.catalog)
+    RecommendHandler.batcher = MicroBatcher(
+        recommender, args.max_batch, args.batch_window_ms / 1000, args.workers
+    )
+    server = RecommendServer((args.host, args.port), RecommendHandler)
+    print(f"serving {recommender.n_careers} careers on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        RecommendHandler.batcher.close()
+        if args.watch:
+            recommender.stop()
+
+
+if __name__ == "__main__":
+    main()
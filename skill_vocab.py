@@ -0,0 +1,128 @@
+# ===================== IMPORTS =====================
+from functools import lru_cache
+
+# ===================== ALIAS MAP =====================
+# canonical skill -> spellings that mean the same thing. Keys and aliases are
+# compared after lowercasing and collapsing whitespace.
+ALIASES = {
+    "machine learning": ["ml"],
+    "deep learning": ["dl"],
+    "nlp": ["natural language processing"],
+    "scikit-learn": ["sklearn", "scikit learn", "scikit"],
+    "tensorflow": ["tensor flow"],
+    "pytorch": ["torch", "py torch"],
+    "numpy": ["num py"],
+    "node.js": ["node", "nodejs", "node js"],
+    "javascript": ["js", "java script"],
+    "react": ["reactjs", "react.js", "react js"],
+    "react native": ["react-native"],
+    "html": ["html5"],
+    "css": ["css3"],
+    "apis": ["api", "rest api", "rest apis", "restful apis"],
+    "power bi": ["powerbi", "power-bi"],
+    "excel": ["ms excel", "microsoft excel"],
+    "c++": ["cpp"],
+    "c#": ["csharp", "c sharp"],
+    "aws": ["amazon web services"],
+    "azure": ["microsoft azure"],
+    "gcp": ["google cloud", "google cloud platform"],
+    "kubernetes": ["k8s"],
+    "ci/cd": ["cicd", "ci cd", "ci-cd"],
+    "photoshop": ["adobe photoshop"],
+    "illustrator": ["adobe illustrator"],
+    "after effects": ["adobe after effects"],
+    "premiere pro": ["adobe premiere pro", "premiere"],
+    "adobe xd": ["xd"],
+    "web3.js": ["web3", "web3js"],
+    "statistics": ["stats"],
+    "seo": ["search engine optimization"],
+    "ux research": ["user research"],
+}
+
+# ambiguous short forms ("CV" is also a resume, "TS" a timestamp): they only
+# apply when a whole entry is exactly the alias, never to free text (resume
+# scanning) or to a partly typed skill (autocomplete)
+SHORT_ALIASES = {
+    "computer vision": ["cv"],
+    "tensorflow": ["tf"],
+    "typescript": ["ts"],
+    "ui design": ["ui"],
+    "ux design": ["ux"],
+}
+
+_ALIAS_TO_CANONICAL = {
+    " ".join(alias.split()): canonical
+    for aliases_of in (ALIASES, SHORT_ALIASES)
+    for canonical, aliases in aliases_of.items()
+    for alias in aliases
+}
+
+
+# ===================== CANONICALISATION =====================
+@lru_cache(maxsize=65536)
+def canonical(raw):
+    # "  Sklearn " -> "scikit-learn"; each distinct raw string is normalised once
+    key = " ".join(raw.lower().split())
+    return _ALIAS_TO_CANONICAL.get(key, key)
+
+
+def canonical_skills(required_skills):
+    # comma separated catalog / user text -> set of canonical skills
+    skills = {canonical(s) for s in required_skills.split(",")}
+    skills.discard("")
+    return skills
+
+
+def canonical_set(user_skills):
+    skills = {canonical(s) for s in user_skills}
+    skills.discard("")
+    return skills
+
+
+def canonical_text(skills):
+    # canonical comma separated text for the TF-IDF side, so "ML" and
+    # "Machine Learning" produce the same tokens
+    if isinstance(skills, str):
+        skills = canonical_skills(skills)
+    else:
+        skills = canonical_set(skills)
+    return ", ".join(sorted(skills))
+
+
+# ===================== VOCABULARY =====================
+class SkillVocabulary:
+    """Canonical skill <-> integer id, plus the first display spelling seen."""
+
+    def __init__(self):
+        self.ids = {}
+        self.names = []
+        self.display = []
+
+    @classmethod
+    def from_names(cls, names, display=None):
+        vocab = cls()
+        vocab.names = list(names)
+        vocab.display = list(display) if display is not None else list(names)
+        vocab.ids = {name: j for j, name in enumerate(vocab.names)}
+        return vocab
+
+    def __len__(self):
+        return len(self.names)
+
+    def intern(self, raw):
+        name = canonical(raw)
+        j = self.ids.get(name)
+        if j is None:
+            j = self.ids[name] = len(self.names)
+            self.names.append(name)
+            self.display.append(" ".join(raw.split()))
+        return j
+
+    def lookup(self, raw):
+        # query side: never grows the vocabulary
+        return self.ids.get(canonical(raw))
+
+    def lookup_all(self, raw_skills):
+        ids = {self.lookup(s) for s in raw_skills}
+        ids.discard(None)
+        return ids
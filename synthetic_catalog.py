@@ -0,0 +1,150 @@
+# ===================== IMPORTS =====================
+import argparse
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+from catalog import CATALOG_PATH
+from skill_vocab import canonical
+
+# Synthetic career catalogs of any size, shaped like the real one.
+#
+#   python synthetic_catalog.py 100000 -o synthetic-100k.csv
+#
+# Every synthetic career starts from a seed career's skill list (so the
+# length distribution and typical combinations carry over). Each skill is
+# kept with probability KEEP, dropped skills are replaced by a skill that
+# co-occurs with one that was kept, and a few long-tail skills are added
+# from a Zipf distribution over the seed vocabulary plus generated niche
+# skills. The vocabulary grows with the catalog (Heaps' law), like real
+# taxonomies do.
+
+KEEP = 0.8
+EXTRA_SKILLS = 1.0  # mean long-tail skills added per career
+ZIPF = 1.1
+NICHE = ["advanced", "cloud", "applied", "enterprise", "embedded", "mobile", "data", "ops", "design", "security"]
+
+
+# ===================== SKILL MODEL =====================
+class SkillModel:
+    """Skill frequencies and co-occurrence learned from the seed catalog."""
+
+    def __init__(self, seed):
+        self.seed = seed.reset_index(drop=True)
+        self.names = []
+        ids = {}
+        self.templates = []
+        for req in self.seed["Required_Skills"]:
+            row = []
+            for raw in str(req).split(","):
+                key = canonical(raw)
+                if not key:
+                    continue
+                if key not in ids:
+                    ids[key] = len(self.names)
+                    self.names.append(" ".join(raw.split()))
+                if ids[key] not in row:
+                    row.append(ids[key])
+            self.templates.append(np.array(row, dtype=np.int64))
+
+        self.freq = np.bincount(np.concatenate(self.templates), minlength=len(self.names)).astype(float)
+        pairs = defaultdict(lambda: defaultdict(int))
+        for row in self.templates:
+            for a in row:
+                for b in row:
+                    if a != b:
+                        pairs[a][b] += 1
+        self.neighbours = {}
+        for a, counts in pairs.items():
+            near = np.array(list(counts), dtype=np.int64)
+            weights = np.array([counts[b] for b in near], dtype=float)
+            self.neighbours[a] = (near, np.cumsum(weights) / weights.sum())
+
+    @classmethod
+    def from_csv(cls, path=CATALOG_PATH):
+        seed = pd.read_csv(path, encoding="latin1")
+        seed.columns = seed.columns.str.strip()
+        return cls(seed)
+
+    def vocabulary(self, n_careers):
+        # seed skills by frequency, then niche variants ("python cloud 3")
+        n_extra = int(20 * n_careers ** 0.5)
+        order = np.argsort(-self.freq, kind="stable")
+        names = [self.names[j] for j in order]
+        for i in range(n_extra):
+            base = names[i % len(order)]
+            names.append(f"{base} {NICHE[(i // len(order)) % len(NICHE)]} {i // (len(order) * len(NICHE)) + 1}")
+        weights = 1 / np.arange(1, len(names) + 1) ** ZIPF
+        # ids in `names` order; seed skill j sits at position rank[j]
+        rank = np.empty(len(order), dtype=np.int64)
+        rank[order] = np.arange(len(order))
+        return names, weights / weights.sum(), rank
+
+    # ---------- generation ----------
+    def skill_lists(self, n, rng):
+        names, tail_p, rank = self.vocabulary(n)
+        seed_cum = np.cumsum(self.freq) / self.freq.sum()
+        template_ids = rng.integers(len(self.templates), size=n)
+        n_tail = rng.poisson(EXTRA_SKILLS, size=n)
+        tail = iter(rng.choice(len(names), size=int(n_tail.sum()), p=tail_p))
+        lists = []
+        for t, extra in zip(template_ids, n_tail):
+            template = self.templates[t]
+            kept = template[rng.random(len(template)) < KEEP]
+            chosen = dict.fromkeys(rank[kept].tolist())
+            for _ in range(len(template) - len(kept)):
+                anchor = int(kept[rng.integers(len(kept))]) if len(kept) else -1
+                if anchor in self.neighbours:
+                    near, cum = self.neighbours[anchor]
+                    swap = near[min(np.searchsorted(cum, rng.random()), len(near) - 1)]
+                else:
+                    swap = min(np.searchsorted(seed_cum, rng.random()), len(seed_cum) - 1)
+                chosen[int(rank[swap])] = None
+            for _ in range(extra):
+                chosen[int(next(tail))] = None
+            if not chosen:
+                chosen[int(rank[template[0]])] = None
+            lists.append([names[j] for j in chosen])
+        return lists
+
+    def catalog(self, n, seed=0):
+        rng = np.random.default_rng(seed)
+        template_ids = rng.integers(len(self.seed), size=n)
+        df = self.seed.iloc[template_ids].reset_index(drop=True)
+        df["Career"] = [f"{career} #{i + 1}" for i, career in enumerate(df["Career"])]
+        df["Required_Skills"] = [",".join(skills) for skills in self.skill_lists(n, rng)]
+        return df
+
+    def profiles(self, n, seed=1):
+        # user skill selections: part of a seed career's skills plus a popular extra
+        rng = np.random.default_rng(seed)
+        seed_p = self.freq / self.freq.sum()
+        out = []
+        for t in rng.integers(len(self.templates), size=n):
+            template = self.templates[t]
+            picked = set(template[rng.random(len(template)) < 0.6].tolist())
+            picked.add(int(rng.choice(len(seed_p), p=seed_p)))
+            out.append([self.names[j] for j in picked])
+        return out
+
+
+def write_catalog(df, path):
+    # same encoding as the real catalog, which load_catalog() reads as latin1
+    df.to_csv(path, index=False, encoding="latin1", errors="replace")
+
+
+# ===================== CLI =====================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic career catalog from the seed CSV.")
+    parser.add_argument("careers", type=int)
+    parser.add_argument("-o", "--output", required=True)
+    parser.add_argument("--seed-catalog", default=CATALOG_PATH)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    model = SkillModel.from_csv(args.seed_catalog)
+    write_catalog(model.catalog(args.careers, args.seed), args.output)
+
+
+if __name__ == "__main__":
+    main()
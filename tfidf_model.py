@@ -0,0 +1,210 @@
+# ===================== IMPORTS =====================
+import hashlib
+import os
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+
+from inverted_index import InvertedIndex
+
+# bump whenever the on-disk layout or the tokenisation changes
+ARTIFACT_VERSION = 2
+ARTIFACT_DIR = "artifacts"
+
+
+# ===================== CATALOG HASH =====================
+def catalog_hash(skills):
+    h = hashlib.sha256(f"tfidf-v{ARTIFACT_VERSION}".encode())
+    for req in skills:
+        h.update(b"\x00")
+        h.update(str(req).encode("utf-8"))
+    return h.hexdigest()
+
+
+def row_hashes(texts):
+    return np.array([int.from_bytes(hashlib.blake2b(t.encode("utf-8"), digest_size=8).digest(), "little")
+                     for t in texts], dtype=np.uint64)
+
+
+# ===================== TF-IDF MODEL =====================
+class TfidfModel:
+    """Fitted TF-IDF vocabulary, IDF weights and L2-normalised career matrix.
+
+    Equivalent to ``TfidfVectorizer().fit_transform(skills)`` but fitted once,
+    so a query only pays for ``transform`` plus one sparse dot product. The raw
+    term counts and a hash per row are kept, so ``refit`` on an edited catalog
+    only tokenises the rows that changed.
+    """
+
+    def __init__(self, vocabulary, idf, matrix, key=None, counts=None, hashes=None):
+        self.vocabulary = vocabulary
+        self.idf = idf
+        self.matrix = matrix
+        self.key = key
+        self.counts = counts
+        self.hashes = hashes
+        self._index = None
+        # default TfidfVectorizer tokenisation (lowercase, \b\w\w+\b)
+        self._analyzer = TfidfVectorizer().build_analyzer()
+
+    @classmethod
+    def fit(cls, skills):
+        skills = list(skills)
+        vec = CountVectorizer()
+        counts = vec.fit_transform(skills).tocsr()
+        vocabulary = {term: int(i) for term, i in vec.vocabulary_.items()}
+        return cls._from_counts(vocabulary, counts, catalog_hash(skills), row_hashes(skills))
+
+    @classmethod
+    def _from_counts(cls, vocabulary, counts, key, hashes):
+        # TfidfVectorizer defaults: smooth idf, raw tf, l2 rows
+        counts.sort_indices()
+        n_rows = counts.shape[0]
+        df = np.bincount(counts.indices, minlength=counts.shape[1])
+        idf = np.log((1 + n_rows) / (1 + df)) + 1
+        return cls(vocabulary, idf, cls._weigh(counts, idf), key, counts, hashes)
+
+    @staticmethod
+    def _weigh(counts, idf):
+        weights = sparse.csr_matrix((counts.data * idf[counts.indices], counts.indices, counts.indptr),
+                                    shape=counts.shape)
+        norms = np.sqrt(np.asarray(weights.multiply(weights).sum(axis=1)).ravel())
+        norms[norms == 0] = 1
+        weights.data /= np.repeat(norms, np.diff(weights.indptr))
+        return weights
+
+    def refit(self, skills):
+        # same result as fit(skills); rows whose text is unchanged reuse their counts
+        skills = list(skills)
+        hashes = row_hashes(skills)
+        previous = {}
+        for i, h in enumerate(self.hashes.tolist()):
+            previous.setdefault(h, i)
+        source = np.array([previous.get(h, -1) for h in hashes.tolist()], dtype=np.int64)
+        kept = self.counts[np.maximum(source, 0)]
+        terms = dict(self.vocabulary)
+        rows, cols, data = [], [], []
+        for i in np.flatnonzero(source < 0).tolist():
+            tokens = {}
+            for token in self._analyzer(skills[i]):
+                j = terms.setdefault(token, len(terms))
+                tokens[j] = tokens.get(j, 0) + 1
+            rows.extend([i] * len(tokens))
+            cols.extend(tokens)
+            data.extend(tokens.values())
+        kept.data[np.repeat(source < 0, np.diff(kept.indptr))] = 0
+        kept.resize(len(skills), len(terms))
+        counts = (kept + sparse.csr_matrix((np.asarray(data, dtype=kept.dtype), (rows, cols)),
+                                           shape=(len(skills), len(terms)))).tocsr()
+        counts.eliminate_zeros()
+
+        # drop terms no row uses any more, columns in alphabetical order like fit()
+        used = np.bincount(counts.indices, minlength=len(terms)) > 0
+        names = np.empty(len(terms), dtype=object)
+        names[list(terms.values())] = list(terms)
+        old = np.flatnonzero(used)
+        old = old[np.argsort(names[old].astype(str), kind="stable")]
+        remap = np.full(len(terms), -1, dtype=np.int64)
+        remap[old] = np.arange(len(old))
+        counts = sparse.csr_matrix((counts.data, remap[counts.indices], counts.indptr), shape=(len(skills), len(old)))
+        vocabulary = {str(names[j]): i for i, j in enumerate(old.tolist())}
+        return self._from_counts(vocabulary, counts, catalog_hash(skills), hashes)
+
+    # ---------- persistence ----------
+    def save(self, path):
+        terms = np.empty(len(self.vocabulary), dtype=object)
+        for term, i in self.vocabulary.items():
+            terms[i] = term
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            np.savez(
+                f,
+                version=np.int64(ARTIFACT_VERSION),
+                key=np.str_(self.key or ""),
+                terms=terms.astype(str),
+                idf=self.idf,
+                counts=self.counts.data.astype(np.int32),
+                indices=self.counts.indices,
+                indptr=self.counts.indptr,
+                shape=np.asarray(self.counts.shape, dtype=np.int64),
+                hashes=self.hashes,
+            )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as z:
+            if int(z["version"]) != ARTIFACT_VERSION:
+                raise ValueError(f"TF-IDF artifact {path} has version {int(z['version'])}, expected {ARTIFACT_VERSION}")
+            vocabulary = {str(term): i for i, term in enumerate(z["terms"])}
+            counts = sparse.csr_matrix(
+                (z["counts"], z["indices"], z["indptr"]), shape=tuple(z["shape"])
+            )
+            # the weighted matrix is cheap to rebuild from the counts
+            return cls(vocabulary, z["idf"], cls._weigh(counts, z["idf"]), str(z["key"]), counts, z["hashes"])
+
+    # ---------- query ----------
+    def transform(self, texts):
+        indptr = [0]
+        indices = []
+        data = []
+        for text in texts:
+            counts = {}
+            for token in self._analyzer(text):
+                j = self.vocabulary.get(token)
+                if j is not None:
+                    counts[j] = counts.get(j, 0) + 1
+            cols = sorted(counts)
+            weights = np.array([counts[j] for j in cols], dtype=np.float64) * self.idf[cols]
+            norm = np.sqrt(np.dot(weights, weights))
+            if norm > 0:
+                weights /= norm
+            indices.extend(cols)
+            data.extend(weights)
+            indptr.append(len(indices))
+        return sparse.csr_matrix(
+            (np.asarray(data, dtype=np.float64), np.asarray(indices, dtype=np.int32), indptr),
+            shape=(len(texts), len(self.vocabulary))
+        )
+
+    def similarity(self, user_text):
+        # both sides are L2-normalised, so the dot product is the cosine
+        return (self.transform([user_text]) @ self.matrix.T).toarray().ravel()
+
+    def similarity_many(self, user_texts):
+        return (self.transform(user_texts) @ self.matrix.T).toarray()
+
+    @property
+    def index(self):
+        if self._index is None:
+            self._index = InvertedIndex.from_matrix(self.matrix)
+        return self._index
+
+    def top_k(self, user_text, k):
+        user = self.transform([user_text])
+        return self.index.top_k(dict(zip(user.indices.tolist(), user.data.tolist())), k)
+
+
+# ===================== LOAD OR FIT =====================
+def artifact_path(key, artifact_dir=ARTIFACT_DIR):
+    return os.path.join(artifact_dir, f"tfidf-v{ARTIFACT_VERSION}-{key[:16]}.npz")
+
+
+def load_or_fit(skills, artifact_dir=ARTIFACT_DIR, previous=None):
+    # previous: the model of an earlier version of the catalog, refitted incrementally
+    skills = list(skills)
+    key = catalog_hash(skills)
+    path = artifact_path(key, artifact_dir)
+    if os.path.exists(path):
+        try:
+            model = TfidfModel.load(path)
+            if model.key == key:
+                return model
+        except (OSError, ValueError, KeyError):
+            pass  # unreadable or stale artifact, refit below
+
+    model = TfidfModel.fit(skills) if previous is None or previous.counts is None else previous.refit(skills)
+    os.makedirs(artifact_dir, exist_ok=True)
+    model.save(path)
+    return model